@@ -0,0 +1,102 @@
+"""Decode benchmark suite.
+
+    python -m benchmarks run [--only NAME,...] [--output results.json]
+    python -m benchmarks compare old.json new.json [--threshold 0.1]
+
+`compare` exits with status 1 when a workload's ops/s dropped by more than
+the threshold, so two runs (e.g. before and after a change) can gate a merge.
+Focused comparisons live next to it: benchmarks.enums, benchmarks.encode,
+benchmarks.parallel, benchmarks.single_pass, benchmarks.construct and
+benchmarks.slots.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from python_dejson.dejson import set_backend
+
+from . import runner
+from .workloads import WORKLOADS
+
+
+def _run(args: argparse.Namespace) -> None:
+    names = args.only.split(",") if args.only else list(WORKLOADS)
+    set_backend(args.backend)
+
+    results = {}
+    print(
+        f"{'workload':>16} {'ops/s':>10} {'items/s':>12}"
+        f" {'p50':>9} {'p99':>9} {'peak':>10}"
+    )
+    for name in names:
+        workload = WORKLOADS[name]
+        payload = workload.payload(random.Random(args.seed))
+        r = runner.run(workload, payload, args.min_time, args.min_runs)
+        results[name] = r
+        print(
+            f"{name:>16} {r['ops_per_sec']:>10.1f} {r['items_per_sec']:>12.0f}"
+            f" {r['p50_ms']:>7.2f}ms {r['p99_ms']:>7.2f}ms {r['peak_kib']:>7.0f}KiB"
+        )
+
+    if args.output:
+        meta = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "seed": args.seed,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+def _compare(args: argparse.Namespace) -> int:
+    with open(args.old) as f:
+        old = json.load(f)["results"]
+    with open(args.new) as f:
+        new = json.load(f)["results"]
+
+    regressions = []
+    print(f"{'workload':>16} {'old ops/s':>10} {'new ops/s':>10} {'change':>8}")
+    for name in [name for name in old if name in new]:
+        before = old[name]["ops_per_sec"]
+        after = new[name]["ops_per_sec"]
+        change = after / before - 1
+        mark = ""
+        if change < -args.threshold:
+            regressions.append(name)
+            mark = " REGRESSION"
+        print(f"{name:>16} {before:>10.1f} {after:>10.1f} {change:>+7.1%}{mark}")
+
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run")
+    run.add_argument("--only", help="comma separated: " + ",".join(WORKLOADS))
+    run.add_argument("--output", help="save results as JSON")
+    run.add_argument("--backend", default="interpreter")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--min-time", type=float, default=1.0)
+    run.add_argument("--min-runs", type=int, default=5)
+
+    compare = sub.add_parser("compare")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        return _compare(args)
+    _run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
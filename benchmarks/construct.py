@@ -0,0 +1,68 @@
+"""Constructing decoded instances: __init__ vs trusted construction.
+
+    python -m benchmarks.construct [--size N]
+
+Each kind of class is built twice with the same fields, one of the twins is
+set to trusted construction.
+"""
+import argparse
+import timeit
+from dataclasses import make_dataclass
+from typing import Any
+
+from python_dejson.dejson import from_object, set_construction
+
+_FIELDS = [("id", int), ("name", str), ("score", float), ("tags", list[str])]
+
+
+def _plain(name: str) -> type:
+    def __init__(self, id, name, score, tags):
+        self.id = id
+        self.name = name
+        self.score = score
+        self.tags = tags
+
+    return type(name, (), {"__annotations__": dict(_FIELDS), "__init__": __init__})
+
+
+def _classes() -> list[tuple[str, Any, Any]]:
+    kinds = [
+        ("plain class", _plain),
+        ("dataclass", lambda name: make_dataclass(name, _FIELDS)),
+        ("frozen dataclass", lambda name: make_dataclass(name, _FIELDS, frozen=True)),
+    ]
+    return [(kind, make("Init"), make("Trusted")) for kind, make in kinds]
+
+
+def _best(fns: list[Any], repeat: int) -> list[float]:
+    # runs are interleaved, so a noisy moment doesn't favor one of them
+    best = [float("inf")] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            best[i] = min(best[i], timeit.timeit(fn, number=1))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = [
+        {"id": i, "name": f"n{i}", "score": i / 2, "tags": ["a"]}
+        for i in range(args.size)
+    ]
+    for kind, init_cls, trusted_cls in _classes():
+        set_construction(trusted_cls, "trusted")
+        fns = [
+            lambda: from_object(payload, list[init_cls]),
+            lambda: from_object(payload, list[trusted_cls]),
+        ]
+        print(kind)
+        for name, best in zip(["__init__", "trusted"], _best(fns, args.repeat)):
+            print(f"{name:>20} {best:.4f}s {args.size / best:>12.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Encoding a large `list[Event]`: to_json vs dataclasses.asdict + json.dumps.
+
+    python -m benchmarks.encode [--size N]
+"""
+import argparse
+import json
+import timeit
+from dataclasses import asdict
+
+from python_dejson.dejson import from_object
+from python_dejson.encode import to_json
+
+from .models import Event, event_payload
+
+
+def _asdict_json(events: list[Event]) -> str:
+    return json.dumps([asdict(e) for e in events], default=lambda o: o.value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = from_object([event_payload(i) for i in range(args.size)], list[Event])
+    assert json.loads(to_json(events, list[Event])) == json.loads(_asdict_json(events))
+
+    for name, fn in [
+        ("asdict + json.dumps", lambda: _asdict_json(events)),
+        ("to_json", lambda: to_json(events, list[Event])),
+        (
+            "round trip",
+            lambda: from_object(
+                json.loads(to_json(events, list[Event])), list[Event]
+            ),
+        ),
+    ]:
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{name:>20} {best:.4f}s {args.size / best:>12.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Enum value lookup: a scan over the members vs the cached value index.
+
+    python -m benchmarks.enums
+"""
+import enum
+import timeit
+
+from python_dejson.dejson import _compile
+
+
+def _scan(typ: enum.EnumMeta, val: object) -> object:
+    # the lookup used before the index
+    for v in typ:
+        if val == v.value:
+            return v
+    return None
+
+
+def main() -> None:
+    print(f"{'members':>8} {'lookup':>7} {'scan':>10} {'index':>10} {'speedup':>8}")
+
+    for size in [3, 30, 300]:
+        typ = enum.Enum("E", {f"m{i}": i for i in range(size)})
+        decode = _compile(typ)
+
+        for name, val in [("first", 0), ("last", size - 1), ("miss", -1)]:
+            n = 100000
+            scan = timeit.timeit(lambda: _scan(typ, val), number=n) / n
+            index = timeit.timeit(lambda: decode(val, 1), number=n) / n
+            print(
+                f"{size:>8} {name:>7} {scan * 1e9:>8.0f}ns {index * 1e9:>8.0f}ns"
+                f" {scan / index:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
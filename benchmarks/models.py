@@ -0,0 +1,100 @@
+"""Annotated classes shared by the benchmarks.
+
+They live in an importable module so worker processes can unpickle them.
+"""
+from dataclasses import dataclass, field, make_dataclass
+from typing import Union
+import enum
+
+
+class Kind(enum.Enum):
+    click = "click"
+    view = "view"
+    buy = "buy"
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    kind: Kind
+    user: str
+    tags: list[str]
+    props: dict[str, float]
+
+
+def event_payload(i: int) -> dict:
+    return {
+        "id": i,
+        "kind": ("click", "view", "buy")[i % 3],
+        "user": f"user-{i % 1000}",
+        "tags": ["a", "b", "c"],
+        "props": {"x": 1.0, "y": 2.5},
+    }
+
+
+# wide flat class: 50 plain fields
+Wide = make_dataclass(
+    "Wide",
+    [(f"f{i}", (int, str, float, bool)[i % 4]) for i in range(50)],
+    frozen=True,
+)
+Wide.__module__ = __name__
+
+
+# deep nesting, shaped like ComplexClass in examples/example.py
+class A(enum.Enum):
+    a = 1
+    b = 2
+    c = 2
+
+
+@dataclass(frozen=True)
+class D:
+    x: A
+
+
+@dataclass(frozen=True)
+class Base:
+    a: str
+
+
+@dataclass(frozen=True)
+class ComplexClass(Base):
+    b: tuple[int, str]
+    c: dict[str, int]
+    d: list[int]
+    e: A
+    f: D
+    g: int | str
+    h: set[int] = field(default_factory=lambda: {9, 9, 9, 9})
+
+
+@dataclass(frozen=True)
+class Level3:
+    items: list[ComplexClass]
+
+
+@dataclass(frozen=True)
+class Level2:
+    children: list[Level3]
+    name: str
+
+
+@dataclass(frozen=True)
+class Level1:
+    children: list[Level2]
+    meta: dict[str, str]
+
+
+# unions with many arms: only the field names tell the arms apart
+Arms = [
+    make_dataclass(f"Arm{i}", [(f"x{i}", int), ("name", str)], frozen=True)
+    for i in range(8)
+]
+for _arm in Arms:
+    _arm.__module__ = __name__
+ManyArms = Union[tuple(Arms)]
+
+
+# large enum, like country or currency codes
+Code = enum.Enum("Code", {f"c{i:03}": f"C{i:03}" for i in range(500)})
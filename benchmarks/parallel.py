@@ -0,0 +1,68 @@
+"""Sequential vs process-pool decoding of a top-level `list[Event]`.
+
+    python -m benchmarks.parallel [--workers N] [--sizes 1000,10000,...]
+
+The pool is started once and reused, as a long-running service would do.
+The crossover is the smallest size where the pool wins.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from python_dejson.dejson import from_object
+from python_dejson.parallel import from_object_parallel
+
+from .models import Event, event_payload
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--sizes", default="1000,10000,50000,200000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+    crossover = None
+
+    print(f"workers={args.workers}")
+    print(f"{'items':>10} {'sequential':>12} {'parallel':>12} {'speedup':>8}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # start the workers before timing
+        from_object_parallel(
+            [event_payload(0)] * args.workers,
+            list[Event],
+            executor=executor,
+            chunk_size=1,
+            min_parallel=0,
+        )
+
+        for n in sizes:
+            val = [event_payload(i) for i in range(n)]
+            seq = _best_of(lambda: from_object(val, list[Event]), args.repeat)
+            par = _best_of(
+                lambda: from_object_parallel(
+                    val, list[Event], executor=executor, min_parallel=0
+                ),
+                args.repeat,
+            )
+            if crossover is None and par < seq:
+                crossover = n
+            print(f"{n:>10} {seq:>11.4f}s {par:>11.4f}s {seq / par:>7.2f}x")
+
+    print(f"crossover: {crossover if crossover is not None else 'not reached'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Timing and memory measurement of one workload."""
+import time
+import tracemalloc
+from typing import Any
+
+from python_dejson.dejson import from_object
+from python_dejson.errors import ValidationErrors
+
+from .workloads import Workload
+
+
+def _decode(payload: Any, typ: Any) -> None:
+    try:
+        from_object(payload, typ)
+    except ValidationErrors:
+        pass
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    i = min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))
+    return sorted_values[i]
+
+
+def run(
+    workload: Workload, payload: Any, min_time: float, min_runs: int
+) -> dict[str, float]:
+    """Decode payload until both min_time and min_runs are reached."""
+    typ = workload.typ
+    # compile and warm up outside of the measurement
+    _decode(payload, typ)
+
+    latencies = []
+    total = 0.0
+    while total < min_time or len(latencies) < min_runs:
+        start = time.perf_counter()
+        _decode(payload, typ)
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        total += elapsed
+
+    tracemalloc.start()
+    try:
+        _decode(payload, typ)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "runs": len(latencies),
+        "ops_per_sec": len(latencies) / total,
+        "items_per_sec": len(latencies) * workload.items / total,
+        "p50_ms": _percentile(latencies, 50) * 1e3,
+        "p90_ms": _percentile(latencies, 90) * 1e3,
+        "p99_ms": _percentile(latencies, 99) * 1e3,
+        "peak_kib": peak / 1024,
+    }
@@ -0,0 +1,51 @@
+"""Decoding a large JSON document: two-pass from_json vs single_pass.
+
+    python -m benchmarks.single_pass [--size N]
+
+Peak memory is traced in a separate decode, the timings are without tracing.
+"""
+import argparse
+import json
+import random
+import timeit
+import tracemalloc
+from typing import Any
+
+from python_dejson.dejson import from_json
+
+from .models import Event, Level1, event_payload
+from .workloads import _deep
+
+
+def _peak_kib(fn: Any) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = [event_payload(i) for i in range(args.size)]
+    cases = [
+        ("events", json.dumps(events), list[Event]),
+        ("deep_nesting", json.dumps(_deep(random.Random(0))), Level1),
+    ]
+    for name, s, typ in cases:
+        assert from_json(s, typ) == from_json(s, typ, single_pass=True)
+        print(f"{name} ({len(s) / 1024 / 1024:.1f} MiB of JSON)")
+        for mode, single_pass in [("two-pass", False), ("single_pass", True)]:
+            fn = lambda: from_json(s, typ, single_pass=single_pass)
+            best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print(f"{mode:>20} {best:.4f}s {_peak_kib(fn):>10.0f}KiB peak")
+
+
+if __name__ == "__main__":
+    main()
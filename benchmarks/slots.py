@@ -0,0 +1,73 @@
+"""Decoding into classes with a __dict__ vs slotted classes.
+
+    python -m benchmarks.slots [--size N]
+
+Memory per instance is what the decoded list holds beyond the payload,
+divided by the number of items.
+"""
+import argparse
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+
+from python_dejson.dejson import from_object, slotted
+
+
+@dataclass(frozen=True)
+class Record:
+    id: int
+    name: str
+    score: float
+    tags: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class SlotsRecord:
+    id: int
+    name: str
+    score: float
+    tags: list[str]
+
+
+def _bytes_per_item(payload: list[dict], typ: Any) -> float:
+    tracemalloc.start()
+    try:
+        res = from_object(payload, list[typ])
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del res
+    return size / len(payload)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tags = ["a", "b"]
+    payload = [
+        {"id": i, "name": f"n{i}", "score": i / 2, "tags": tags}
+        for i in range(args.size)
+    ]
+    for name, typ in [
+        ("dataclass", Record),
+        ("dataclass(slots=True)", SlotsRecord),
+        ("slotted(dataclass)", slotted(Record)),
+    ]:
+        from_object(payload, list[typ])
+        best = min(
+            timeit.repeat(
+                lambda: from_object(payload, list[typ]), number=1, repeat=args.repeat
+            )
+        )
+        print(
+            f"{name:>22} {best:.4f}s {args.size / best:>10.0f} items/s"
+            f" {_bytes_per_item(payload, typ):>6.0f} B/item"
+        )
+
+
+if __name__ == "__main__":
+    main()
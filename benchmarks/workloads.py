@@ -0,0 +1,108 @@
+"""Generated, deterministic benchmark payloads.
+
+Every workload is a target type and a payload decoded with one `from_object`
+call. Payloads are built from a fixed seed, so two runs measure the same data.
+"""
+import random
+from typing import Any, Callable, NamedTuple
+
+from .models import (
+    Code,
+    ComplexClass,
+    Event,
+    Level1,
+    ManyArms,
+    Wide,
+    event_payload,
+)
+
+
+class Workload(NamedTuple):
+    typ: Any
+    payload: Callable[[random.Random], Any]
+    # number of top-level items, to report items/s next to ops/s
+    items: int
+
+
+def _wide(rnd: random.Random) -> dict:
+    values = (
+        lambda: rnd.randint(0, 1 << 30),
+        lambda: f"s{rnd.random()}",
+        rnd.random,
+        lambda: rnd.random() < 0.5,
+    )
+    return {f"f{i}": values[i % 4]() for i in range(50)}
+
+
+def _complex(rnd: random.Random) -> dict:
+    return {
+        "a": "a",
+        "b": [rnd.randint(0, 100), "s"],
+        "c": {f"k{i}": i for i in range(5)},
+        "d": [rnd.randint(0, 100) for _ in range(10)],
+        "e": rnd.choice([1, 2]),
+        "f": {"x": rnd.choice([1, 2])},
+        "g": rnd.choice([1, "1"]),
+        "h": [1, 2, 3],
+    }
+
+
+def _deep(rnd: random.Random) -> dict:
+    return {
+        "meta": {"source": "bench"},
+        "children": [
+            {
+                "name": f"l2-{i}",
+                "children": [
+                    {"items": [_complex(rnd) for _ in range(5)]} for _ in range(5)
+                ],
+            }
+            for i in range(8)
+        ],
+    }
+
+
+def _arms(rnd: random.Random) -> list:
+    # most items only match one of the last arms
+    return [
+        {f"x{n}": i, "name": "n"}
+        for i, n in enumerate(rnd.choices(range(8), weights=range(1, 9), k=2000))
+    ]
+
+
+def _invalid_events(rnd: random.Random) -> list:
+    res = []
+    for i in range(5000):
+        p = event_payload(i)
+        if rnd.random() < 0.9:
+            p[rnd.choice(["id", "kind", "tags"])] = None
+        res.append(p)
+    return res
+
+
+WORKLOADS: dict[str, Workload] = {
+    "wide_flat": Workload(
+        list[Wide], lambda rnd: [_wide(rnd) for _ in range(1000)], 1000
+    ),
+    "deep_nesting": Workload(Level1, _deep, 200),
+    "list_int": Workload(
+        list[int],
+        lambda rnd: [rnd.randint(0, 1 << 30) for _ in range(100000)],
+        100000,
+    ),
+    "dict_str_model": Workload(
+        dict[str, ComplexClass],
+        lambda rnd: {f"k{i}": _complex(rnd) for i in range(2000)},
+        2000,
+    ),
+    "union_many_arms": Workload(list[ManyArms], _arms, 2000),
+    "large_enum": Workload(
+        list[Code],
+        lambda rnd: [rnd.choice(list(Code)).value for _ in range(10000)],
+        10000,
+    ),
+    "events": Workload(
+        list[Event], lambda rnd: [event_payload(i) for i in range(5000)], 5000
+    ),
+    "mostly_invalid": Workload(list[Event], _invalid_events, 5000),
+}
@@ -0,0 +1,83 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Callable
+
+from .dejson import from_json
+from .errors import ValidationErrors
+from .stream import _Records, _Splitter, _TextDecoder
+
+
+# payloads from this size on are decoded off the event loop
+THRESHOLD = 64 * 1024
+
+
+async def from_json_async(
+    s: str | bytes | bytearray,
+    typ: Any,
+    *,
+    executor: Executor | None = None,
+    threshold: int = THRESHOLD,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> Any:
+    """Like `from_json`, but decode payloads of threshold chars/bytes or more
+    in executor (the loop's default one if None), not on the event loop.
+
+    A process pool executor also takes the decoding off the GIL; typ must be
+    picklable then.
+    """
+    decode = functools.partial(
+        from_json, s, typ, fail_fast=fail_fast, max_errors=max_errors
+    )
+    if len(s) < threshold:
+        return decode()
+    return await asyncio.get_running_loop().run_in_executor(executor, decode)
+
+
+async def _read_chunks(
+    stream: asyncio.StreamReader | AsyncIterable[bytes | str], chunk_size: int
+) -> AsyncIterator[bytes | str]:
+    if isinstance(stream, asyncio.StreamReader):
+        while True:
+            chunk = await stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        async for chunk in stream:
+            yield chunk
+
+
+async def aiter_json(
+    stream: asyncio.StreamReader | AsyncIterable[bytes | str],
+    typ: Any,
+    *,
+    format: str = "auto",
+    skip_invalid: bool = False,
+    on_error: Callable[[ValidationErrors], None] | None = None,
+    chunk_size: int = 65536,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> AsyncIterator[Any]:
+    """Like `stream.iter_json`, reading from an asyncio.StreamReader or any
+    async iterator of text or utf-8 bytes chunks.
+
+    Records are decoded as their chunks arrive, one chunk at a time, and the
+    event loop gets control back after each chunk, so other tasks run between
+    chunks even when the stream is already buffered.
+    """
+    splitter = _Splitter(format)
+    records = _Records(typ, skip_invalid, on_error, fail_fast, max_errors)
+    text_decoder = _TextDecoder()
+
+    async for chunk in _read_chunks(stream, chunk_size):
+        for item in records.decode(splitter.feed(text_decoder.decode(chunk))):
+            yield item
+        # a buffered reader returns without suspending: yield to the loop
+        await asyncio.sleep(0)
+
+    for item in records.decode(splitter.feed(text_decoder.flush())):
+        yield item
+    for item in records.decode(splitter.close()):
+        yield item
@@ -0,0 +1,187 @@
+import enum
+import keyword
+import linecache
+from typing import Any
+
+from . import instrument, interning
+from .dejson import (
+    _REQUIRED,
+    _SKIP,
+    _Decode,
+    _cache_key,
+    _class_compilers,
+    _class_meta,
+    _compile,
+    _compile_annotated_class,
+    _constructor,
+    _decoders,
+    _enum_index,
+    _field_missing,
+    _is_plain,
+    _prefix,
+    _wrap,
+)
+from .errors import (
+    ValidationExtraFieldError,
+    ValidationFieldRequiredError,
+    ValidationTypeError,
+)
+
+
+def _emit_failed(emit: Any, indent: str) -> None:
+    emit(f"{indent}if len(errors) >= limit:")
+    emit(f"{indent}    return None, errors")
+
+
+def _emit_decode(emit: Any, indent: str, i: int, key: str, target: str) -> None:
+    emit(f"{indent}m, err = _dec{i}(v, limit)")
+    emit(f"{indent}if err:")
+    emit(f"{indent}    errors.extend(_prefix(err, {key}))")
+    _emit_failed(emit, indent + "    ")
+    emit(f"{indent}else:")
+    emit(f"{indent}    {target} = m")
+
+
+def _function_name(typ: Any) -> str:
+    name = typ.__name__ if typ.__name__.isidentifier() else "cls"
+    return f"decode_{name}"
+
+
+def _generate(typ: Any) -> tuple[str, dict[str, Any], list[tuple[int, Any]]]:
+    """Return the source of a decoder for typ, its globals and the
+    (index, type) of the fields that call a nested decoder `_dec{index}`."""
+    types = _class_meta(typ).types
+    ns: dict[str, Any] = {
+        "ValidationExtraFieldError": ValidationExtraFieldError,
+        "ValidationFieldRequiredError": ValidationFieldRequiredError,
+        "ValidationTypeError": ValidationTypeError,
+        "_prefix": _prefix,
+        "_cls": typ,
+        "_construct": _constructor(typ),
+        "_names": frozenset(types),
+        "_expected": _class_meta(typ).names,
+    }
+    nested: list[tuple[int, Any]] = []
+    kwargs: list[str] = []
+    has_skip = False
+
+    lines: list[str] = []
+    emit = lines.append
+
+    emit(f"def {_function_name(typ)}(val, limit):")
+    emit("    if type(val) is not dict:")
+    emit("        return None, [ValidationTypeError(val, dict, [])]")
+    emit("    errors = []")
+    emit("    if not _names.issuperset(val):")
+    emit("        for k, v in val.items():")
+    emit("            if k not in _names:")
+    emit("                errors.append(")
+    emit("                    ValidationExtraFieldError(k, v, _expected, [k])")
+    emit("                )")
+    _emit_failed(emit, "                ")
+
+    body_start = len(lines)
+    for i, (k, t) in enumerate(types.items()):
+        key = repr(k)
+        missing = _field_missing(typ, k)
+        ns[f"_t{i}"] = t
+
+        if missing is _SKIP:
+            has_skip = True
+            target = f"kw[{key}]"
+        else:
+            target = f"f{i}"
+            kwargs.append(f"{k}=f{i}")
+
+        emit(f"    if {key} in val:")
+        emit(f"        v = val[{key}]")
+
+        if _is_plain(t):
+            emit(f"        if isinstance(v, _t{i}):")
+            emit(f"            {target} = v")
+            emit("        else:")
+            emit(f"            errors.append(ValidationTypeError(v, _t{i}, [{key}]))")
+            _emit_failed(emit, "            ")
+        elif type(t) is enum.EnumMeta:
+            # a miss falls back to the enum decoder, which scans the members
+            # that are not indexed and creates the error
+            ns[f"_idx{i}"] = _enum_index(t)[0]
+            nested.append((i, t))
+            emit("        try:")
+            emit(f"            m = _idx{i}.get(v)")
+            emit("        except TypeError:")
+            emit("            m = None")
+            emit("        if m is not None:")
+            emit(f"            {target} = m")
+            emit("        else:")
+            _emit_decode(emit, "            ", i, key, target)
+        else:
+            nested.append((i, t))
+            _emit_decode(emit, "        ", i, key, target)
+
+        if missing is _REQUIRED:
+            emit("    else:")
+            emit(
+                "        errors.append("
+                f"ValidationFieldRequiredError({key}, _t{i}, [{key}]))"
+            )
+            _emit_failed(emit, "        ")
+        elif missing is not _SKIP:
+            ns[f"_d{i}"] = missing
+            emit("    else:")
+            emit(f"        f{i} = _d{i}")
+
+    if has_skip:
+        lines.insert(body_start, "    kw = {}")
+        kwargs.append("**kw")
+
+    emit("    if errors:")
+    emit("        return None, errors")
+    if ns["_construct"] is None:
+        emit(f"    return _cls({', '.join(kwargs)}), errors")
+    else:
+        emit(f"    return _construct(dict({', '.join(kwargs)})), errors")
+
+    return "\n".join(lines) + "\n", ns, nested
+
+
+def _can_generate(typ: Any) -> bool:
+    return all(
+        type(k) is str and k.isidentifier() and not keyword.iskeyword(k)
+        for k in _class_meta(typ).types
+    )
+
+
+def _codegen_annotated_class(typ: Any) -> _Decode:
+    if not _can_generate(typ) or instrument.enabled or interning.enabled:
+        # fields that can't be passed as keywords, or inlined field checks
+        # that stats or interning would not see
+        return _compile_annotated_class(typ)
+
+    src, ns, nested = _generate(typ)
+    filename = f"<dejson codegen {typ.__module__}.{typ.__qualname__}>"
+    # keep the source around for tracebacks and debuggers
+    linecache.cache[filename] = (len(src), None, src.splitlines(True), filename)
+    exec(compile(src, filename, "exec"), ns)
+    decode = ns[_function_name(typ)]
+
+    # nested decoders are resolved after the decoder is cached, so
+    # self-referencing classes get the decoder being built
+    key = _cache_key(typ)
+    _decoders.register(key, _wrap(typ, decode))
+    try:
+        for i, t in nested:
+            ns[f"_dec{i}"] = _compile(t)
+    except BaseException:
+        _decoders.unregister(key)
+        raise
+
+    return decode
+
+
+def source(typ: Any) -> str:
+    """Return the source the codegen backend generates for an annotated class."""
+    return _generate(typ)[0]
+
+
+_class_compilers["codegen"] = _codegen_annotated_class
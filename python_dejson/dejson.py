@@ -1,10 +1,26 @@
 import json
-from typing import Any
+import mmap
+import os
+import sys
+import threading
 import enum
-from types import UnionType
-from typing import Union, get_args, get_origin, Any
-from dataclasses import is_dataclass, fields, Field, MISSING
+from contextlib import contextmanager
+from types import MemberDescriptorType, UnionType
+from typing import (
+    Annotated,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Union,
+    get_args,
+    get_origin,
+    Any,
+)
+import weakref
+from dataclasses import dataclass, is_dataclass, fields, Field, InitVar, MISSING
 
+from . import instrument, interning, memo
 from .errors import (
     ValidationError,
     ValidationErrors,
@@ -18,7 +34,21 @@ from .errors import (
 
 # TOD0: try to extract type annotation from cls.__init__
 # inspect.get_annotations(cls.__init__)
-def cls_types(cls: type) -> dict[str, type]:
+def _is_annotated_class(typ: Any) -> bool:
+    """Return whether typ is decoded field by field from its annotations."""
+    if not hasattr(typ, "__dict__"):
+        return False
+    if "__annotations__" in typ.__dict__:
+        return True
+    # a subclass that only declares __slots__ adds no fields
+    return (
+        "__slots__" in typ.__dict__
+        and isinstance(typ, type)
+        and any(_is_annotated_class(b) for b in typ.__bases__)
+    )
+
+
+def _cls_types(cls: type) -> dict[str, type]:
     types_all = {}
 
     for typ in reversed(cls.mro()):
@@ -30,21 +60,25 @@ def cls_types(cls: type) -> dict[str, type]:
     return types_all
 
 
-def cls_defaults(cls: type) -> dict[str, Any]:
+def _cls_defaults(cls: type) -> dict[str, Any]:
     defaults_all = {}
 
     for typ in reversed(cls.mro()):
         if "__annotations__" in typ.__dict__:
             attrs = typ.__dict__
             types = attrs["__annotations__"]
-            defaults = {k: attrs[k] for k in types.keys() if k in attrs}
+            # a slot of the field is not its default
+            defaults = {
+                k: attrs[k]
+                for k in types.keys()
+                if k in attrs and type(attrs[k]) is not MemberDescriptorType
+            }
             defaults_all.update(defaults)
 
     return defaults_all
 
 
-def cls_fields(cls: type) -> dict[str, Field]:
-    """Return dataclass fields with with set values default|default_factory"""
+def _cls_fields(cls: type) -> dict[str, Field]:
     name_field_dict = {}
 
     if is_dataclass(cls):
@@ -55,200 +89,1339 @@ def cls_fields(cls: type) -> dict[str, Field]:
     return name_field_dict
 
 
-def _type_annotated_class(
-    val: Any, typ: Any, keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    errors = []
+class _ClassMeta(NamedTuple):
+    types: dict[str, type]
+    defaults: dict[str, Any]
+    fields: dict[str, Field]
+    # field names, shared by the extra field errors of the class
+    names: tuple[str, ...]
 
-    if type(val) is not dict:
-        errors.append(ValidationTypeError(val, dict, keys))
-        return None, errors
 
-    types = cls_types(typ)
-    defaults = cls_defaults(typ)
-    fields = cls_fields(typ)
+def _build_class_meta(cls: type) -> _ClassMeta:
+    types = _cls_types(cls)
+    return _ClassMeta(types, _cls_defaults(cls), _cls_fields(cls), tuple(types))
 
-    for k, v in val.items():
-        if k not in types:
-            errors.append(
-                ValidationExtraFieldError(k, v, list(types.keys()), keys + [k])
-            )
 
-    attrs = {}
-    for k, t in types.items():
-        if k in val:
-            v, err = _from_object(val[k], t, keys + [k])
-            if err:
-                errors.extend(err)
-            else:
-                attrs[k] = v
-        elif k in defaults:
-            attrs[k] = defaults[k]
-        elif k in fields:
-            # ok skip
-            continue
+# weak keys: dynamically created classes can still be collected
+_class_meta_cache: "weakref.WeakKeyDictionary[type, _ClassMeta]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _class_meta(cls: type) -> _ClassMeta:
+    try:
+        return _class_meta_cache[cls]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak referenceable: compute every time
+        return _build_class_meta(cls)
+
+    meta = _build_class_meta(cls)
+    _class_meta_cache[cls] = meta
+    return meta
+
+
+# the public accessors return copies of the cached metadata, which compiled
+# decoders rely on
+
+
+def cls_types(cls: type) -> dict[str, type]:
+    """Return merged annotations of cls and its bases."""
+    return dict(_class_meta(cls).types)
+
+
+def cls_defaults(cls: type) -> dict[str, Any]:
+    """Return merged class attribute defaults of annotated fields."""
+    return dict(_class_meta(cls).defaults)
+
+
+def cls_fields(cls: type) -> dict[str, Field]:
+    """Return dataclass fields with with set values default|default_factory"""
+    return dict(_class_meta(cls).fields)
+
+
+def invalidate(cls: type | None = None) -> None:
+    """Drop cached metadata and decoders after a class was changed at runtime.
+
+    Metadata of cls and of its cached subclasses is recomputed on next use.
+    Compiled decoders (and encoders) and memoized instances may embed any
+    class, so all of them are dropped. Without cls every cache is cleared.
+    """
+    if cls is None:
+        _class_meta_cache.clear()
+    else:
+        for c in list(_class_meta_cache.keys()):
+            if cls in c.__mro__:
+                _class_meta_cache.pop(c, None)
+
+    for m in list(_memos.values()):
+        m.clear()
+    _clear_compiled()
+
+
+def slotted(cls: type) -> type:
+    """Return a twin of the annotated class cls with __slots__ for its fields.
+
+    Instances of the twin have no __dict__, which saves memory when many of
+    them are decoded. The twin has the same name, fields and methods (merged
+    from the bases of cls), but no bases: methods using zero-argument super()
+    don't work and it is not picklable by name. Field defaults of plain
+    classes can't be kept beside the slots, only dataclasses may have them.
+    """
+    types = _class_meta(cls).types
+
+    ns: dict[str, Any] = {}
+    slots: dict[str, None] = dict.fromkeys(types)
+    for c in reversed(cls.__mro__[:-1]):
+        ns.update(c.__dict__)
+        c_slots = c.__dict__.get("__slots__", ())
+        slots.update(dict.fromkeys([c_slots] if isinstance(c_slots, str) else c_slots))
+    slots.pop("__dict__", None)
+
+    defaults = _class_meta(cls).defaults
+    if defaults and not is_dataclass(cls):
+        names = ", ".join(defaults)
+        raise Exception(f"slotted twin of a class with field defaults {names}: {cls}")
+
+    for k in [*slots, "__dict__", "__weakref__", _HOSTED]:
+        ns.pop(k, None)
+    ns["__slots__"] = tuple(slots)
+    ns["__annotations__"] = dict(types)
+    ns["__qualname__"] = cls.__qualname__
+
+    return type(cls)(cls.__name__, (), ns)
+
+
+# Decoders don't know where their value sits in the document: errors are
+# created with keys relative to the decoded value and a container prefixes
+# its key only when a child failed, so the success path builds no paths.
+# Containers stop decoding once they collected `limit` errors.
+_Decode = Callable[[Any, int], tuple[Any, list[ValidationError]]]
+
+# field has no value and no default: report it as required
+_REQUIRED = object()
+# field has a dataclass default_factory: let the constructor fill it
+_SKIP = object()
+
+
+# compiled objects of a type referencing an annotated class (or an enum) are
+# kept in this attribute of the class, so they don't keep it alive
+_HOSTED = "__dejson_compiled__"
+
+
+def _host(key: Any) -> type | None:
+    """Return the first annotated class or enum the type of a cache key
+    references."""
+    typ = key[0] if type(key) is tuple else key
+    if isinstance(typ, type):
+        if _is_annotated_class(typ) or type(typ) is enum.EnumMeta:
+            return typ
+        return None
+    # __args__ rather than get_args, this is on the lookup path
+    for t in getattr(typ, "__args__", ()):
+        host = _host(t)
+        if host is not None:
+            return host
+    return None
+
+
+class _TypeCache:
+    """Compiled objects (decoders, encoders, ...) by the cache key of a type.
+
+    Compiled objects may reference each other (self-referencing classes), so
+    they are registered before they are complete. What a compilation
+    registers is published once the outermost one finished, see _compiling:
+    lookups without the compile lock only see complete objects.
+
+    Objects of a type referencing a class are stored in the class, see
+    _host: a dynamically created class can be collected with everything
+    compiled for it. A type referencing several classes (`dict[A, B]`) is
+    stored in the first one.
+    """
+
+    __slots__ = ("_entries", "_pending", "_hosts")
+
+    def __init__(self):
+        self._entries: dict[Any, Any] = {}
+        self._pending: dict[Any, Any] = {}
+        self._hosts: "weakref.WeakSet[type]" = weakref.WeakSet()
+
+    def __getitem__(self, key: Any) -> Any:
+        # keys are classes or (alias, repr); a class that is no host has no
+        # entries in its __dict__ either
+        host = key if type(key) is not tuple else _host(key)
+        if host is not None:
+            hosted = host.__dict__.get(_HOSTED)
+            if hosted is not None:
+                return hosted[self][key]
+        return self._entries[key]
+
+    def lookup(self, key: Any) -> Any:
+        """Like cache[key], including the entries not published yet. Only
+        while compiling."""
+        try:
+            return self._pending[key]
+        except KeyError:
+            return self[key]
+
+    def register(self, key: Any, value: Any) -> None:
+        self._pending[key] = value
+
+    def unregister(self, key: Any) -> None:
+        self._pending.pop(key, None)
+
+    def _store(self, key: Any) -> dict[Any, Any]:
+        host = _host(key)
+        if host is None:
+            return self._entries
+
+        hosted = host.__dict__.get(_HOSTED)
+        if hosted is None:
+            # one dict per cache, created for all of them so that lookups
+            # don't check for a missing one
+            hosted = {c: {} for c in _compiled_caches}
+            try:
+                setattr(host, _HOSTED, hosted)
+            except (AttributeError, TypeError):
+                # a class that refuses attributes is kept alive
+                return self._entries
+        self._hosts.add(host)
+        return hosted.setdefault(self, {})
+
+    def publish(self) -> None:
+        for key, value in self._pending.items():
+            self._store(key)[key] = value
+        self._pending.clear()
+
+    def clear(self) -> None:
+        with _compile_lock:
+            self._entries.clear()
+            self._pending.clear()
+            for host in list(self._hosts):
+                host.__dict__[_HOSTED].get(self, {}).clear()
+            self._hosts.clear()
+
+
+_decoders = _TypeCache()
+
+# caches of everything compiled from class metadata, dropped by invalidate
+_compiled_caches: list[_TypeCache] = [_decoders]
+
+# compilations are serialized, a nested one runs in the thread of the outer
+_compile_lock = threading.RLock()
+_compile_depth = 0
+
+
+@contextmanager
+def _compiling() -> Iterator[None]:
+    """Hold the compile lock; publish what was registered when the outermost
+    compilation finishes, or drop it if that failed."""
+    global _compile_depth
+
+    with _compile_lock:
+        _compile_depth += 1
+        try:
+            yield
+        except BaseException:
+            if _compile_depth == 1:
+                for cache in _compiled_caches:
+                    cache._pending.clear()
+            raise
         else:
-            errors.append(ValidationFieldRequiredError(k, t, keys + [k]))
+            if _compile_depth == 1:
+                for cache in _compiled_caches:
+                    cache.publish()
+        finally:
+            _compile_depth -= 1
 
-    if not errors:
-        return typ(**attrs), errors
 
-    return None, errors
+def _clear_compiled() -> None:
+    for cache in _compiled_caches:
+        cache.clear()
 
 
-def _type_type(
-    val: Any, typ: Any, keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    errors = []
-    if isinstance(val, typ):
-        return val, errors
+def _cache_key(typ: Any) -> Any:
+    # typing considers `int | str` and `str | int` equal, but the order of
+    # union arms changes the result, so aliases are also keyed by their repr
+    if isinstance(typ, type):
+        return typ
+    return (typ, repr(typ))
+
+
+def _prefix(errors: list[ValidationError], k: Any) -> list[ValidationError]:
+    for e in errors:
+        e.keys.insert(0, k)
+    return errors
+
+
+def _field_missing(typ: Any, k: str) -> Any:
+    """Return what a field gets when the payload lacks it: its default,
+    _SKIP for a default_factory or _REQUIRED."""
+    meta = _class_meta(typ)
+    defaults, fields = meta.defaults, meta.fields
+    if k in defaults:
+        return defaults[k]
+    if k in fields:
+        # slotted dataclasses keep their defaults in the fields only
+        if fields[k].default is not MISSING:
+            return fields[k].default
+        return _SKIP
+    return _REQUIRED
+
+
+# classes decoded without calling their __init__, see set_construction
+_trusted: "weakref.WeakSet[type]" = weakref.WeakSet()
+
+
+def set_construction(cls: type, name: str) -> None:
+    """Select how decoded instances of cls are constructed.
+
+    "init" (the default) calls cls(**fields). "trusted" skips __init__: the
+    instance is allocated with object.__new__, the fields are stored in its
+    __dict__ or slots directly, default factories are run by the decoder and
+    __post_init__ is still called. Only the field types are validated, so
+    keep it for input of a trusted shape, e.g. files written by the app.
+
+    It pays off for frozen dataclasses and classes with a costly __init__,
+    see benchmarks.construct. A trusted __dict__ doesn't share its keys with
+    other instances, so it takes more memory than one filled by __init__.
+    """
+    if name not in ("init", "trusted"):
+        raise ValueError(f"unsupported construction: {name}")
+
+    if name == "trusted":
+        _trusted.add(cls)
     else:
-        errors.append(ValidationTypeError(val, typ, keys))
+        _trusted.discard(cls)
+
+    _clear_compiled()
+
+
+def _slot_setters(typ: Any, names: Iterable[str]) -> dict[str, Callable]:
+    """Return the slot __set__ of each field of typ stored in a slot."""
+    setters = {}
+    for k in names:
+        for c in typ.__mro__:
+            d = c.__dict__.get(k)
+            if type(d) is MemberDescriptorType:
+                setters[k] = d.__set__
+                break
+    return setters
+
+
+def _constructor(typ: Any) -> Callable[[dict[str, Any]], Any] | None:
+    """Return what builds a trusted instance of typ from a dict of its fields
+    (the dict is taken over), None to call typ(**fields)."""
+    if typ not in _trusted:
+        return None
+
+    meta = _class_meta(typ)
+    if any(isinstance(t, InitVar) for t in meta.types.values()):
+        raise Exception(f"trusted construction of a class with InitVar: {typ}")
+
+    new = object.__new__
+    set_attr = object.__setattr__
+    factories = [
+        (k, f.default_factory)
+        for k, f in meta.fields.items()
+        if f.default_factory is not MISSING
+    ]
+    post_init = getattr(typ, "__post_init__", None)
+    setters = _slot_setters(typ, meta.types)
+
+    if not setters:
+
+        def construct(attrs: dict[str, Any]) -> Any:
+            obj = new(typ)
+            for k, factory in factories:
+                if k not in attrs:
+                    attrs[k] = factory()
+            set_attr(obj, "__dict__", attrs)
+            if post_init is not None:
+                obj.__post_init__()
+            return obj
+
+        return construct
+
+    if typ.__dictoffset__ == 0 and setters.keys() != meta.types.keys():
+        names = ", ".join(k for k in meta.types if k not in setters)
+        raise Exception(f"no slot for fields of {typ}: {names}")
+
+    def construct_slotted(attrs: dict[str, Any]) -> Any:
+        obj = new(typ)
+        for k, factory in factories:
+            if k not in attrs:
+                attrs[k] = factory()
+        for k, v in attrs.items():
+            setter = setters.get(k)
+            if setter is None:
+                obj.__dict__[k] = v
+            else:
+                setter(obj, v)
+        if post_init is not None:
+            obj.__post_init__()
+        return obj
+
+    return construct_slotted
+
+
+def _compile_annotated_class(
+    typ: Any, projection: "Projection | None" = None
+) -> _Decode:
+    types = _class_meta(typ).types
+    expected_names = _class_meta(typ).names
+
+    # filled after the decoder is cached, so self-referencing classes
+    # resolve to the decoder being built
+    plan: list[tuple[str, Any, _Decode, Any]] = []
+    # fields left out by the projection
+    unset: dict[str, Any] = {}
+    construct = _constructor(typ)
+
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        errors = []
+
+        if type(val) is not dict:
+            errors.append(ValidationTypeError(val, dict, []))
+            return None, errors
+
+        for k, v in val.items():
+            if k not in types:
+                errors.append(
+                    ValidationExtraFieldError(k, v, expected_names, [k])
+                )
+                if len(errors) >= limit:
+                    return None, errors
+
+        attrs = {}
+        for k, t, field_decode, missing in plan:
+            if k in val:
+                v, err = field_decode(val[k], limit)
+                if err:
+                    errors.extend(_prefix(err, k))
+                    if len(errors) >= limit:
+                        break
+                else:
+                    attrs[k] = v
+            elif missing is _REQUIRED:
+                errors.append(ValidationFieldRequiredError(k, t, [k]))
+                if len(errors) >= limit:
+                    break
+            elif missing is not _SKIP:
+                attrs[k] = missing
+
+        if not errors:
+            if unset:
+                attrs.update(unset)
+            if construct is None:
+                return typ(**attrs), errors
+            return construct(attrs), errors
+
         return None, errors
 
+    if projection is None:
+        key = _cache_key(typ)
+        wrapped = _wrap(typ, decode)
+        subs = dict.fromkeys(types)
+    else:
+        key = _cache_key(Annotated[typ, projection])
+        wrapped = _wrap(Annotated[typ, projection], decode)
+        subs = dict(projection.fields)
+        if subs.keys() - types.keys():
+            names = ", ".join(sorted(subs.keys() - types.keys()))
+            raise Exception(f"unknown fields in projection of {typ}: {names}")
 
-def _type_enum(
-    val: Any, typ: Any, keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    errors = []
+    _decoders.register(key, wrapped)
+    try:
+        for k, t in types.items():
+            if k not in subs:
+                unset[k] = UNSET
+                continue
+            if subs[k] is not None:
+                t = _project(t, subs[k])
+            field_decode = _compile(t)
+            if instrument.enabled:
+                field_decode = instrument.wrap_field(typ, k, t, field_decode)
+            plan.append((k, t, field_decode, _field_missing(typ, k)))
+    except BaseException:
+        _decoders.unregister(key)
+        raise
 
-    for v in typ:
-        if val == v.value:
-            return v, errors
+    return decode
 
-    errors.append(ValidationTypeError(val, typ, keys))
-    return None, errors
 
+def _compile_type(typ: Any) -> _Decode:
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        if isinstance(val, typ):
+            return val, []
+        return None, [ValidationTypeError(val, typ, [])]
 
-def _type_union(
-    val: Any, typ_orig: Any, typ_args: tuple[Any, ...], keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    errors = []
+    if _kept_as_is(typ):
+        return decode
+
+    intern_str = interning.intern_str
+
+    def decode_interned(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        if type(val) is str:
+            return intern_str(val), []
+        return decode(val, limit)
+
+    return decode_interned
+
+
+def _enum_index(typ: Any) -> tuple[dict[Any, Any], tuple[Any, ...]]:
+    """Split enum members into a value index and members that must be scanned.
+
+    The first member with a given value wins, like a scan over the enum. Members
+    from the first one with an unhashable value on can't be indexed without
+    changing that order, they are compared one by one after an index miss.
+    """
+    index: dict[Any, Any] = {}
+    members = tuple(typ)
+
+    for i, v in enumerate(members):
+        try:
+            index.setdefault(v.value, v)
+        except TypeError:
+            return index, members[i:]
+
+    return index, ()
+
+
+def _compile_enum(typ: Any) -> _Decode:
+    index, rest = _enum_index(typ)
+    members = tuple(typ)
+
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        try:
+            v = index.get(val)
+        except TypeError:
+            # unhashable value: only a scan can compare it
+            for v in members:
+                if val == v.value:
+                    return v, []
+            return None, [ValidationTypeError(val, typ, [])]
+
+        if v is not None:
+            return v, []
+
+        for v in rest:
+            if val == v.value:
+                return v, []
+
+        return None, [ValidationTypeError(val, typ, [])]
+
+    return decode
+
+
+@dataclass(frozen=True)
+class Discriminator:
+    """Union metadata: pick the arm by the value of a field of the payload.
+
+    Each arm must be an annotated class with a default for the field, the
+    default (or the value of a default enum member) is the tag of the arm:
+
+        Annotated[Cat | Dog, Discriminator("kind")]
+    """
+
+    field: str
+
+
+def _accepts(typ: Any) -> tuple[type, ...] | None:
+    """Return the value types typ can possibly decode from, None for any."""
+    if _is_annotated_class(typ):
+        return (dict,)
+
+    if type(typ) is type:
+        return (typ,)
+
+    if type(typ) is enum.EnumMeta:
+        return None
+
+    typ_orig = get_origin(typ)
+
+    if typ_orig is Annotated:
+        return _accepts(get_args(typ)[0])
+
+    if typ_orig in (UnionType, Union):
+        accepts: tuple[type, ...] = ()
+        for t in get_args(typ):
+            a = _accepts(t)
+            if a is None:
+                return None
+            accepts += a
+        return accepts
+
+    if typ_orig in [tuple, set, list]:
+        return (tuple, set, list)
+
+    if typ_orig is dict:
+        return (dict,)
+
+    return None
+
+
+def _compile_union(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Decode:
+    # arms that can't decode the type of the value are skipped untried
+    arms = [(_accepts(t), _compile(t)) for t in typ_args]
+
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        for accepts, arm in arms:
+            if accepts is not None and not isinstance(val, accepts):
+                continue
+            # the errors of a failed arm are dropped, one is enough
+            v, err = arm(val, 1)
+            if not err:
+                return v, err
+        return None, [ValidationTypesError(val, typ_args, [])]
+
+    if not instrument.enabled:
+        return decode
+
+    counter = instrument.union_counter(typ_args)
+    indexed_arms = list(enumerate(arms))
+
+    def decode_counted(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        for i, (accepts, arm) in indexed_arms:
+            if accepts is not None and not isinstance(val, accepts):
+                continue
+            v, err = arm(val, 1)
+            if not err:
+                counter.hits[i] += 1
+                return v, err
+        counter.misses += 1
+        return None, [ValidationTypesError(val, typ_args, [])]
+
+    return decode_counted
+
+
+def _compile_tagged_union(typ_args: tuple[Any, ...], field: str) -> _Decode:
+    tags: dict[Any, _Decode] = {}
     for t in typ_args:
-        v, err = _from_object(val, t, keys)
-        if err:
-            pass
-            # TODO: ignore?
-        else:
-            return v, errors
+        tag = _REQUIRED
+        if _is_annotated_class(t) and field in _class_meta(t).types:
+            tag = _field_missing(t, field)
+        if tag is _REQUIRED or tag is _SKIP:
+            raise Exception(f"discriminator {field} has no default in: {t}")
+        if isinstance(tag, enum.Enum):
+            tag = tag.value
+        tags.setdefault(tag, _compile(t))
 
-    errors.append(ValidationTypesError(val, typ_args, keys))
-    return None, errors
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        if type(val) is dict:
+            try:
+                arm = tags.get(val.get(field))
+            except TypeError:
+                arm = None
+            if arm is not None:
+                return arm(val, limit)
+        return None, [ValidationTypesError(val, typ_args, [])]
 
+    return decode
+
+
+class _Unset:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "UNSET"
+
+    def __reduce__(self):
+        return "UNSET"
+
+
+# value of the fields left out by a projection
+UNSET: Any = _Unset()
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Annotated metadata: decode only some fields of an annotated class.
+
+    fields pairs each decoded field with None, to decode it whole, or with the
+    Projection of the classes in its value. The other fields are set to UNSET
+    without being looked at. See `project` to build one from a mask.
+    """
+
+    fields: tuple[tuple[str, "Projection | None"], ...]
+
+
+def _projection(mask: Any) -> Projection:
+    if isinstance(mask, dict):
+        items = [
+            (k, None if v is True or v is None else _projection(v))
+            for k, v in mask.items()
+        ]
+    else:
+        items = [(k, None) for k in mask]
+    return Projection(tuple(sorted(items, key=lambda item: item[0])))
 
-def _type_list(
-    val: Any, typ_orig: Any, typ_args: tuple[Any, ...], keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    errors = []
 
+def _project(typ: Any, projection: Projection) -> Any:
+    """Return typ with projection applied to the annotated classes in it."""
+    if _is_annotated_class(typ):
+        return Annotated[typ, projection]
+
+    typ_orig = get_origin(typ)
+    typ_args = get_args(typ)
+
+    if typ_orig is Annotated:
+        # the arms of a discriminated union are decoded whole
+        if any(isinstance(m, Discriminator) for m in typ.__metadata__):
+            return typ
+        return Annotated[(_project(typ_args[0], projection), *typ.__metadata__)]
+
+    if typ_orig in (UnionType, Union):
+        return Union[tuple(_project(t, projection) for t in typ_args)]
+
+    if typ_orig in [tuple, set, list]:
+        return typ_orig[
+            tuple(t if t is Ellipsis else _project(t, projection) for t in typ_args)
+        ]
+
+    if typ_orig is dict:
+        return dict[typ_args[0], _project(typ_args[1], projection)]
+
+    return typ
+
+
+def project(typ: Any, mask: Any) -> Any:
+    """Return typ with its annotated classes decoding only the fields in mask.
+
+    mask is a collection of field names or a dict of field names to True
+    (decode the field whole) or to the mask of the classes in the field,
+    through lists, dicts and unions:
+
+        project(Order, {"user": {"id", "email"}, "items": {"sku"}})
+
+    Fields left out are neither validated nor recursed into and are set to
+    UNSET, required projected fields are still checked. The result is a
+    type: compile it once to reuse the projected decoder.
+    """
+    return _project(typ, _projection(mask))
+
+
+def _compile_annotated(typ: Any) -> _Decode:
+    inner = get_args(typ)[0]
+
+    for meta in typ.__metadata__:
+        if isinstance(meta, Projection):
+            return _compile_annotated_class(inner, meta)
+        if isinstance(meta, Discriminator):
+            if get_origin(inner) in (UnionType, Union):
+                return _compile_tagged_union(get_args(inner), meta.field)
+            return _compile_tagged_union((inner,), meta.field)
+
+    return _compile(inner)
+
+
+def _is_plain(typ: Any) -> bool:
+    """Return whether values of typ are checked by isinstance and kept as is."""
+    return type(typ) is type and not _is_annotated_class(typ)
+
+
+def _kept_as_is(typ: Any) -> bool:
+    """Return whether typ is plain and its values are decoded as themselves,
+    not replaced by interned ones."""
+    if typ is str and interning.intern_str is not None:
+        return False
+    return _is_plain(typ)
+
+
+def _compile_list(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Decode:
     (t,) = typ_args
-    res = []
-    for k, v in enumerate(val):
-        rv, err = _from_object(v, t, keys + [k])
-        if err:
-            errors.extend(err)
-        else:
-            res.append(rv)
+    elem_decode = _compile(t)
 
-    return res, errors
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        errors = []
+        res = []
+        for k, v in enumerate(val):
+            rv, err = elem_decode(v, limit)
+            if err:
+                errors.extend(_prefix(err, k))
+                if len(errors) >= limit:
+                    break
+            else:
+                res.append(rv)
+        return res, errors
 
+    if not _kept_as_is(t):
+        return decode
 
-def _type_set(
-    val: Any, typ_orig: Any, typ_args: tuple[Any, ...], keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    v, err = _type_list(val, typ_orig, typ_args, keys)
-    return set(v), err
+    check = t.__instancecheck__
 
+    def decode_plain(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        # nothing to convert: check all items in one pass and return the input
+        # list itself, decode item by item only to collect the errors
+        if all(map(check, val)):
+            return (val if type(val) is list else list(val)), []
+        return decode(val, limit)
 
-def _type_tuple(
-    val: Any, typ_orig: Any, typ_args: tuple[Any, ...], keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    errors = []
+    return decode_plain
 
-    if len(val) != len(typ_args):
-        errors.append(ValidationTupleLenError(val, typ_args, keys))
 
-    res = []
-    for k, (v, t) in enumerate(zip(val, typ_args)):
-        rv, err = _from_object(v, t, keys + [k])
-        if err:
-            errors.extend(err)
-        else:
-            res.append(rv)
+def _compile_set(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Decode:
+    list_decode = _compile_list(typ_orig, typ_args)
 
-    return tuple(res), errors
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        v, err = list_decode(val, limit)
+        return set(v), err
 
+    return decode
 
-def _type_dict(
-    val: Any, typ_orig: Any, typ_args: tuple[Any, ...], keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    errors = []
 
-    if type(val) is not dict:
-        errors.append(ValidationTypeError(val, typ_orig, keys))
-        return None, errors
+def _compile_variadic_tuple(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Decode:
+    list_decode = _compile_list(typ_orig, typ_args[:1])
+
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        v, err = list_decode(val, limit)
+        return tuple(v), err
+
+    return decode
+
+
+def _compile_tuple(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Decode:
+    elem_decoders = [_compile(t) for t in typ_args]
+
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        errors = []
+
+        if len(val) != len(typ_args):
+            errors.append(ValidationTupleLenError(val, typ_args, []))
+            if len(errors) >= limit:
+                return None, errors
+
+        res = []
+        for k, (v, elem_decode) in enumerate(zip(val, elem_decoders)):
+            rv, err = elem_decode(v, limit)
+            if err:
+                errors.extend(_prefix(err, k))
+                if len(errors) >= limit:
+                    break
+            else:
+                res.append(rv)
+
+        return tuple(res), errors
 
+    return decode
+
+
+def _compile_sequence(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Decode:
+    if typ_orig is list:
+        seq_decode = _compile_list(typ_orig, typ_args)
+    elif typ_orig is set:
+        seq_decode = _compile_set(typ_orig, typ_args)
+    elif len(typ_args) == 2 and typ_args[1] is Ellipsis:
+        seq_decode = _compile_variadic_tuple(typ_orig, typ_args)
+    else:
+        seq_decode = _compile_tuple(typ_orig, typ_args)
+
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        if type(val) in (tuple, set, list):
+            return seq_decode(val, limit)
+        return None, [ValidationTypesError(val, [tuple, set, list], [])]
+
+    return decode
+
+
+def _compile_dict(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Decode:
     kt, vt = typ_args
-    res = {}
-    for k, v in val.items():
-        rk, err_k = _from_object(k, kt, keys + [k])
-        rv, err_v = _from_object(v, vt, keys + [k])
-        if err_k or err_v:
-            errors.extend(err_k)
-            errors.extend(err_v)
-        else:
-            res[rk] = rv
+    key_decode = _compile(kt)
+    value_decode = _compile(vt)
+    key_plain = _kept_as_is(kt)
+
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        errors = []
+
+        if type(val) is not dict:
+            errors.append(ValidationTypeError(val, typ_orig, []))
+            return None, errors
+
+        res = {}
+        for k, v in val.items():
+            if key_plain and isinstance(k, kt):
+                rk, err_k = k, []
+            else:
+                rk, err_k = key_decode(k, limit)
+            rv, err_v = value_decode(v, limit)
+            if err_k or err_v:
+                errors.extend(_prefix(err_k, k))
+                errors.extend(_prefix(err_v, k))
+                if len(errors) >= limit:
+                    break
+            else:
+                res[rk] = rv
+
+        return res, errors
+
+    if not (key_plain and _kept_as_is(vt)):
+        return decode
+
+    key_check = kt.__instancecheck__
+    value_check = vt.__instancecheck__
+
+    def decode_plain(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        # like lists of plain types: return the input dict itself when valid
+        if (
+            type(val) is dict
+            and all(map(key_check, val))
+            and all(map(value_check, val.values()))
+        ):
+            return val, []
+        return decode(val, limit)
+
+    return decode_plain
 
-    return res, errors
+
+def _compile_unsupported(typ: Any) -> _Decode:
+    def decode(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        raise Exception(f"unsupported type: {typ}, val: {val}")
+
+    return decode
 
 
 # TODO: raise exception when pass not annotated class
 # We need to differentiate built-in class from user-defined.
 # How to do this without using base class and inheritance?
-def _from_object(
-    val: Any, typ: Any, keys: list[Any]
-) -> tuple[Any, list[ValidationError]]:
-    if hasattr(typ, "__dict__") and "__annotations__" in typ.__dict__:
-        return _type_annotated_class(val, typ, keys)
+def _build(typ: Any) -> _Decode:
+    if _is_annotated_class(typ):
+        return _class_compiler(typ)
 
     if type(typ) is type:
-        return _type_type(val, typ, keys)
+        return _compile_type(typ)
 
     if type(typ) is enum.EnumMeta:
-        return _type_enum(val, typ, keys)
+        return _compile_enum(typ)
 
     typ_orig = get_origin(typ)
     typ_args = get_args(typ)
 
+    if typ_orig is Annotated:
+        return _compile_annotated(typ)
+
     if typ_orig in (UnionType, Union):
-        return _type_union(val, typ_orig, typ_args, keys)
+        return _compile_union(typ_orig, typ_args)
 
     if typ_orig in [tuple, set, list]:
-        if type(val) in [tuple, set, list]:
-            if typ_orig is list:
-                return _type_list(val, typ_orig, typ_args, keys)
+        return _compile_sequence(typ_orig, typ_args)
 
-            if typ_orig is set:
-                return _type_set(val, typ_orig, typ_args, keys)
+    if typ_orig is dict:
+        return _compile_dict(typ_orig, typ_args)
 
-            if typ_orig is tuple:
-                return _type_tuple(val, typ_orig, typ_args, keys)
+    return _compile_unsupported(typ)
 
-        return None, [ValidationTypesError(val, [tuple, set, list], keys)]
 
-    if typ_orig is dict:
-        return _type_dict(val, typ_orig, typ_args, keys)
+# how annotated classes are compiled, see set_backend
+_class_compilers: dict[str, Callable[[Any], _Decode]] = {
+    "interpreter": _compile_annotated_class,
+}
+_class_compiler = _compile_annotated_class
+
+
+def set_backend(name: str) -> None:
+    """Select how annotated classes are compiled and drop compiled decoders.
+
+    "interpreter" (the default) runs closures over a plan of the fields,
+    "codegen" generates and exec()s a decoder per class, see `codegen.source`.
+    """
+    global _class_compiler
+
+    if name == "codegen":
+        from . import codegen  # noqa: F401, registers the backend
+
+    if name not in _class_compilers:
+        raise ValueError(f"unsupported backend: {name}")
+
+    _class_compiler = _class_compilers[name]
+    _clear_compiled()
+
+
+def _compile(typ: Any) -> _Decode:
+    try:
+        key = _cache_key(typ)
+        return _decoders[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable annotation (e.g. with unhashable metadata): don't cache
+        with _compiling():
+            return _build(typ)
+
+    with _compiling():
+        try:
+            return _decoders.lookup(key)
+        except KeyError:
+            pass
+
+        decode = _build(typ)
+        try:
+            # a class compiler registered its wrapped decoder itself
+            return _decoders.lookup(key)
+        except KeyError:
+            pass
+        decode = _wrap(typ, decode)
+        _decoders.register(key, decode)
+    return decode
+
+
+def _wrap(typ: Any, decode: _Decode) -> _Decode:
+    """Return decode of typ with interning, memoization and stats applied.
+
+    Class compilers register the wrapped decoder before compiling the
+    fields, so that self-references get it too.
+    """
+    cons = interning.consing(typ)
+    if cons is not None:
+        decode = interning.wrap_class(decode, cons)
+    if typ in _memos:
+        decode = memo.wrap_class(decode, _memos[typ])
+    if instrument.enabled:
+        decode = instrument.wrap_type(typ, decode)
+    return decode
+
 
-    raise Exception(f"unsupported type: {typ}, val: {val}")
+def enable_stats(hook: instrument.Hook | None = None) -> None:
+    """Rebuild decoders to count calls, time and errors, see `stats`.
 
+    hook is called with (type, seconds, errors) after every decode of a type.
+    Decoders built while stats are disabled carry no instrumentation at all.
+    """
+    instrument.enabled = True
+    instrument.hook = hook
+    _clear_compiled()
 
-def from_object(val: Any, typ: Any) -> Any:
-    res, err = _from_object(val, typ, [])
+
+def disable_stats() -> None:
+    instrument.enabled = False
+    instrument.hook = None
+    _clear_compiled()
+
+
+def enable_interning(
+    max_strings: int | None = 65536, max_instances: int = 65536
+) -> None:
+    """Rebuild decoders to share equal decoded values, see `interning_stats`.
+
+    Decoded strings are interned: with sys.intern when max_strings is None,
+    else in a table of max_strings entries (0 turns it off). Equal instances
+    of frozen, hashable dataclasses are decoded as one shared instance, kept
+    in a table of max_instances entries: instances whose fields are equal
+    and of the same types (1 and True are equal). Full tables evict the
+    least recently used entries.
+    """
+    interning.enable(max_strings, max_instances)
+    _clear_compiled()
+
+
+def disable_interning() -> None:
+    interning.disable()
+    _clear_compiled()
+
+
+def interning_stats() -> dict[str, Any]:
+    """Return the size, hits, misses and evictions of the interning tables."""
+    return interning.snapshot()
+
+
+_memos: "weakref.WeakKeyDictionary[type, memo._Memo]" = weakref.WeakKeyDictionary()
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _is_immutable(typ: Any, seen: set[Any]) -> bool:
+    """Return whether decoded values of typ are immutable and decoded from
+    json types only."""
+    if _is_annotated_class(typ):
+        if typ in seen:
+            return True
+        seen.add(typ)
+        params = getattr(typ, "__dataclass_params__", None)
+        return (
+            params is not None
+            and params.frozen
+            and all(_is_immutable(t, seen) for t in _class_meta(typ).types.values())
+        )
+
+    if type(typ) is type:
+        return typ in _JSON_SCALARS
+
+    if type(typ) is enum.EnumMeta:
+        return True
+
+    typ_orig = get_origin(typ)
+    typ_args = get_args(typ)
+
+    if typ_orig is Annotated:
+        return _is_immutable(typ_args[0], seen)
+
+    if typ_orig in (UnionType, Union, tuple):
+        return all(t is Ellipsis or _is_immutable(t, seen) for t in typ_args)
+
+    return False
+
+
+def memoize(cls: type, max_entries: int = 1024, max_bytes: int | None = None) -> None:
+    """Cache decoded instances of cls by the content of their payload.
+
+    A payload equal to a recently decoded one (same json values, in any key
+    order) returns the instance decoded then, without validating it again.
+    At most max_entries instances are kept and, if given, payloads of
+    max_bytes chars of compact json in total, the least recently used are
+    evicted first. Payloads with values of other types are not cached.
+
+    cls must be a frozen dataclass whose fields are immutable: json scalars,
+    enums, tuples and frozen dataclasses of them. The single-pass parser
+    doesn't use the cache.
+    """
+    if not _is_immutable(cls, set()):
+        raise Exception(f"memoized class must be frozen and immutable: {cls}")
+    if max_entries < 1:
+        raise ValueError(f"max_entries must be positive: {max_entries}")
+
+    _memos[cls] = memo._Memo(max_entries, max_bytes)
+    _clear_compiled()
+
+
+def unmemoize(cls: type) -> None:
+    _memos.pop(cls, None)
+    _clear_compiled()
+
+
+def memo_stats() -> dict[str, Any]:
+    """Return the entries, size in chars, hits and misses of each cache."""
+    return {c.__qualname__: m.snapshot() for c, m in _memos.items()}
+
+
+def _settings() -> tuple[Any, ...]:
+    """Return what decoders are compiled with in this process: the backend,
+    the trusted classes, the interning and the memoized classes."""
+    backend = next(k for k, v in _class_compilers.items() if v is _class_compiler)
+    memos = {c: (m.max_entries, m.max_bytes) for c, m in _memos.items()}
+    return backend, frozenset(_trusted), interning.settings(), memos
+
+
+def _apply_settings(settings: tuple[Any, ...]) -> None:
+    """Compile with the _settings of another process, e.g. in a worker."""
+    global _class_compiler
+
+    if settings == _settings():
+        return
+    backend, trusted, interned, memos = settings
+
+    if backend == "codegen":
+        from . import codegen  # noqa: F401, registers the backend
+    _class_compiler = _class_compilers[backend]
+    _trusted.clear()
+    _trusted.update(trusted)
+    if interned is None:
+        interning.disable()
+    else:
+        interning.enable(*interned)
+    _memos.clear()
+    for c, (max_entries, max_bytes) in memos.items():
+        _memos[c] = memo._Memo(max_entries, max_bytes)
+    _clear_compiled()
+
+
+def stats() -> dict[str, Any]:
+    """Return a snapshot of the counters collected since enable_stats.
+
+    "types" and "fields" (as "Class.field") map to calls, errors and
+    cumulative time in seconds, including nested decodes. "unions" map to
+    the hits of every arm and the misses. Distinct classes of the same name
+    are counted apart, the later ones named with " #2", " #3"...
+    """
+    return instrument.snapshot()
+
+
+def reset_stats() -> None:
+    instrument.reset()
+
+
+def _limit(fail_fast: bool, max_errors: int | None) -> int:
+    if fail_fast:
+        return 1
+    if max_errors is None:
+        return sys.maxsize
+    if max_errors < 1:
+        raise ValueError(f"max_errors must be positive: {max_errors}")
+    return max_errors
+
+
+class Decoder:
+    """Decoder compiled once from a type annotation, see `compile`."""
+
+    __slots__ = ("type", "_decode")
+
+    def __init__(self, typ: Any, decode: _Decode):
+        self.type = typ
+        self._decode = decode
+
+    def __repr__(self):
+        return f"Decoder({self.type})"
+
+    def from_object(
+        self, val: Any, *, fail_fast: bool = False, max_errors: int | None = None
+    ) -> Any:
+        limit = _limit(fail_fast, max_errors)
+        res, err = self._decode(val, limit)
+        if err:
+            raise ValidationErrors(self.type, err[:limit])
+        return res
+
+    def from_json(
+        self,
+        s: str | bytes | bytearray,
+        *,
+        fail_fast: bool = False,
+        max_errors: int | None = None,
+    ) -> Any:
+        d = json.loads(s)
+        return self.from_object(d, fail_fast=fail_fast, max_errors=max_errors)
+
+    def from_objects(
+        self,
+        vals: Iterable[Any],
+        *,
+        fail_fast: bool = False,
+        max_errors: int | None = None,
+    ) -> tuple[list[Any], list[list[ValidationError]]]:
+        return _from_objects(self._decode, vals, _limit(fail_fast, max_errors))
+
+
+def compile(typ: Any) -> Decoder:
+    """Walk the annotation tree of typ once and return a reusable decoder.
+
+    Decoders are cached per type, `from_object`/`from_json` use the same cache.
+    """
+    return Decoder(typ, _compile(typ))
+
+
+def from_object(
+    val: Any,
+    typ: Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+    mask: Any = None,
+) -> Any:
+    """Decode val into typ.
+
+    All validation errors are collected by default, fail_fast stops at the
+    first one and max_errors at the given number of errors. With a mask only
+    the fields in it are decoded, see `project`.
+    """
+    limit = _limit(fail_fast, max_errors)
+    decode = _compile(typ if mask is None else project(typ, mask))
+    res, err = decode(val, limit)
     if err:
-        raise ValidationErrors(typ, err)
+        raise ValidationErrors(typ, err[:limit])
     return res
 
 
-def from_json(s: str | bytes | bytearray, typ: Any) -> Any:
+def _from_objects(
+    decode: _Decode, vals: Iterable[Any], limit: int
+) -> tuple[list[Any], list[list[ValidationError]]]:
+    results = []
+    errors = []
+    for val in vals:
+        res, err = decode(val, limit)
+        if err:
+            results.append(None)
+            errors.append(err[:limit])
+        else:
+            results.append(res)
+            errors.append(err)
+    return results, errors
+
+
+def from_objects(
+    vals: Iterable[Any],
+    typ: Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> tuple[list[Any], list[list[ValidationError]]]:
+    """Decode every item of vals into typ, the type is compiled once.
+
+    Nothing is raised for invalid items: the results hold None for them and
+    the per-item error lists, keyed relative to the item, are returned too.
+    """
+    return _from_objects(_compile(typ), vals, _limit(fail_fast, max_errors))
+
+
+def _buffer_to_str(b: memoryview | mmap.mmap) -> str:
+    # decodes straight from the buffer, without a bytes copy of it first
+    encoding = json.detect_encoding(bytes(b[:4]))
+    return str(b, encoding)
+
+
+def from_json(
+    s: str | bytes | bytearray | memoryview | mmap.mmap,
+    typ: Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+    single_pass: bool = False,
+    mask: Any = None,
+) -> Any:
+    """Parse s as JSON and decode it into typ.
+
+    With single_pass, annotated classes (and the lists and dicts of them) are
+    built while s is parsed, without an intermediate dict per object. Results
+    and errors are the same, objects with repeated keys fall back to the
+    two-pass decode.
+
+    single_pass trades speed for memory: the parser is pure Python, so it is
+    about 2-3x slower than json.loads plus the decode, for about a third less
+    peak memory (see benchmarks.single_pass). Use it when memory is tight.
+    """
+    if isinstance(s, (memoryview, mmap.mmap)):
+        s = _buffer_to_str(s)
+    if single_pass:
+        from .parse import _Duplicate, parse
+
+        limit = _limit(fail_fast, max_errors)
+        try:
+            res, err = parse(s, typ if mask is None else project(typ, mask), limit)
+        except _Duplicate:
+            pass
+        else:
+            if err:
+                raise ValidationErrors(typ, err[:limit])
+            return res
     d = json.loads(s)
-    return from_object(d, typ)
+    return from_object(d, typ, fail_fast=fail_fast, max_errors=max_errors, mask=mask)
+
+
+def from_json_file(
+    path: str | os.PathLike,
+    typ: Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> Any:
+    """Decode a JSON file through a memory map, without reading it into memory.
+
+    A top-level array decoded as `list[T]` is parsed and decoded one item at
+    a time, so only the decoded items are held in memory, see also
+    `stream.iter_json_file`.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return from_json(b"", typ)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = bytes(mm[:64]).lstrip()
+            if (
+                get_origin(typ) is list
+                and start.startswith(b"[")
+                and json.detect_encoding(start) == "utf-8"
+            ):
+                from .stream import _from_json_array, _text_chunks
+
+                limit = _limit(fail_fast, max_errors)
+                return _from_json_array(_text_chunks(mm, 1 << 20), typ, limit)
+
+            return from_json(mm, typ, fail_fast=fail_fast, max_errors=max_errors)
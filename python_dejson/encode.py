@@ -0,0 +1,262 @@
+import enum
+import json
+from types import UnionType
+from typing import Annotated, Any, Callable, Union, get_args, get_origin
+
+from .dejson import (
+    _cache_key,
+    _class_meta,
+    _TypeCache,
+    _compiled_caches,
+    _compiling,
+    _is_annotated_class,
+    _is_plain,
+)
+
+
+# None stands for "keep the value as is", so containers of plain types and
+# plain fields are copied without a call per value
+_Encode = Callable[[Any], Any] | None
+
+_encoders = _TypeCache()
+_compiled_caches.append(_encoders)
+
+
+def _instance_types(typ: Any) -> tuple[type, ...] | type:
+    """Return the value types an object encoded as typ can have."""
+    typ_orig = get_origin(typ)
+
+    if typ_orig is Annotated:
+        return _instance_types(get_args(typ)[0])
+
+    if typ_orig in (UnionType, Union):
+        types: tuple[type, ...] = ()
+        for t in get_args(typ):
+            a = _instance_types(t)
+            types += a if isinstance(a, tuple) else (a,)
+        return types
+
+    if typ_orig in [tuple, set, list]:
+        return (tuple, set, list)
+
+    if typ_orig is not None:
+        return typ_orig
+
+    return typ
+
+
+def _encode_annotated_class(typ: Any) -> _Encode:
+    types = _class_meta(typ).types
+
+    # filled after the encoder is cached, for self-referencing classes
+    plan: list[tuple[str, _Encode]] = []
+
+    def encode(obj: Any) -> Any:
+        res = {}
+        for k, field_encode in plan:
+            v = getattr(obj, k)
+            res[k] = v if field_encode is None else field_encode(v)
+        return res
+
+    key = _cache_key(typ)
+    _encoders.register(key, encode)
+    try:
+        plan.extend((k, _compile_encoder(t)) for k, t in types.items())
+    except BaseException:
+        _encoders.unregister(key)
+        raise
+
+    return encode
+
+
+def _encode_enum(typ: Any) -> _Encode:
+    def encode(obj: Any) -> Any:
+        return obj.value
+
+    return encode
+
+
+def _conforms(obj: Any, typ: Any) -> bool:
+    """Return whether obj, with its elements, can have been decoded as typ."""
+    typ_orig = get_origin(typ)
+    typ_args = get_args(typ)
+
+    if typ_orig is Annotated:
+        return _conforms(obj, typ_args[0])
+
+    if typ_orig in (UnionType, Union):
+        return any(_conforms(obj, t) for t in typ_args)
+
+    if not isinstance(obj, _instance_types(typ)):
+        return False
+
+    if typ_orig in [set, list] or (
+        typ_orig is tuple and len(typ_args) == 2 and typ_args[1] is Ellipsis
+    ):
+        return all(_conforms(v, typ_args[0]) for v in obj)
+
+    if typ_orig is tuple:
+        return len(obj) == len(typ_args) and all(
+            _conforms(v, t) for v, t in zip(obj, typ_args)
+        )
+
+    if typ_orig is dict:
+        kt, vt = typ_args
+        return all(_conforms(k, kt) and _conforms(v, vt) for k, v in obj.items())
+
+    return True
+
+
+def _union_arm(obj: Any, typ_args: tuple[Any, ...]) -> int:
+    """Return the index of the arm of typ_args obj was decoded with.
+
+    Containers are told apart by their elements when several arms are
+    containers of the same kind, e.g. `list[int] | list[E]`. Of arms that
+    are a class and its subclass, the one nearest to the type of obj in its
+    MRO wins, e.g. `B` for a B in `A | B`.
+    """
+    arms = [i for i, t in enumerate(typ_args) if isinstance(obj, _instance_types(t))]
+    if not arms:
+        raise Exception(f"no union arm for: {type(obj)} in {typ_args}")
+    if len(arms) > 1:
+        mro = type(obj).__mro__
+        arms.sort(key=lambda i: _mro_distance(mro, typ_args[i]))
+        for i in arms:
+            if _conforms(obj, typ_args[i]):
+                return i
+    return arms[0]
+
+
+def _mro_distance(mro: tuple[type, ...], typ: Any) -> int:
+    types = _instance_types(typ)
+    if not isinstance(types, tuple):
+        types = (types,)
+    return min((mro.index(t) for t in types if t in mro), default=len(mro))
+
+
+def _encode_union(typ_args: tuple[Any, ...]) -> _Encode:
+    arms = [(_instance_types(t), _compile_encoder(t)) for t in typ_args]
+    # the arm for a value type is looked up with isinstance only once, unless
+    # the type matches several arms (containers of the same kind)
+    by_type: dict[type, _Encode] = {}
+
+    def encode(obj: Any) -> Any:
+        typ = type(obj)
+        try:
+            arm = by_type[typ]
+        except KeyError:
+            matched = [e for types, e in arms if isinstance(obj, types)]
+            if len(matched) == 1:
+                arm = by_type[typ] = matched[0]
+            else:
+                arm = arms[_union_arm(obj, typ_args)][1]
+        return obj if arm is None else arm(obj)
+
+    return encode
+
+
+def _encode_sequence(typ_orig: Any, typ_args: tuple[Any, ...]) -> _Encode:
+    if typ_orig is not tuple or (len(typ_args) == 2 and typ_args[1] is Ellipsis):
+        elem_encode = _compile_encoder(typ_args[0])
+
+        if elem_encode is None:
+            return list
+
+        def encode(obj: Any) -> Any:
+            return [elem_encode(v) for v in obj]
+
+        return encode
+
+    elem_encoders = [_compile_encoder(t) for t in typ_args]
+
+    def encode_tuple(obj: Any) -> Any:
+        return [v if e is None else e(v) for e, v in zip(elem_encoders, obj)]
+
+    return encode_tuple
+
+
+def _encode_dict(typ_args: tuple[Any, ...]) -> _Encode:
+    kt, vt = typ_args
+    key_encode = _compile_encoder(kt)
+    value_encode = _compile_encoder(vt)
+
+    if key_encode is None and value_encode is None:
+        return dict
+
+    if key_encode is None:
+
+        def encode_values(obj: Any) -> Any:
+            return {k: value_encode(v) for k, v in obj.items()}
+
+        return encode_values
+
+    def encode(obj: Any) -> Any:
+        return {
+            key_encode(k): v if value_encode is None else value_encode(v)
+            for k, v in obj.items()
+        }
+
+    return encode
+
+
+def _build_encoder(typ: Any) -> _Encode:
+    if _is_annotated_class(typ):
+        return _encode_annotated_class(typ)
+
+    if _is_plain(typ):
+        return None
+
+    if type(typ) is enum.EnumMeta:
+        return _encode_enum(typ)
+
+    typ_orig = get_origin(typ)
+    typ_args = get_args(typ)
+
+    if typ_orig is Annotated:
+        return _compile_encoder(typ_args[0])
+
+    if typ_orig in (UnionType, Union):
+        return _encode_union(typ_args)
+
+    if typ_orig in [tuple, set, list]:
+        return _encode_sequence(typ_orig, typ_args)
+
+    if typ_orig is dict:
+        return _encode_dict(typ_args)
+
+    raise Exception(f"unsupported type: {typ}")
+
+
+def _compile_encoder(typ: Any) -> _Encode:
+    try:
+        key = _cache_key(typ)
+        return _encoders[key]
+    except KeyError:
+        pass
+    except TypeError:
+        with _compiling():
+            return _build_encoder(typ)
+
+    with _compiling():
+        try:
+            return _encoders.lookup(key)
+        except KeyError:
+            pass
+
+        encode = _build_encoder(typ)
+        _encoders.register(key, encode)
+    return encode
+
+
+def to_object(obj: Any, typ: Any) -> Any:
+    """Encode obj of typ into JSON-compatible dicts, lists and values.
+
+    The reverse of `from_object`: annotated classes become dicts, enums their
+    values, tuples and sets lists. obj is not validated against typ.
+    """
+    encode = _compile_encoder(typ)
+    return obj if encode is None else encode(obj)
+
+
+def to_json(obj: Any, typ: Any) -> str:
+    return json.dumps(to_object(obj, typ))
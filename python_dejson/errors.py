@@ -1,7 +1,54 @@
+import reprlib
 from typing import Any
 
 
+class TruncatedValue(str):
+    """Bounded text kept by an error instead of the offending value."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return str(self)
+
+
+# None: errors keep the offending values themselves
+_max_value_len: int | None = None
+_repr = reprlib.Repr()
+
+
+def set_value_retention(max_len: int | None) -> None:
+    """Keep at most max_len chars of the offending values in new errors.
+
+    Numbers, bools, None and short strings are kept as is, other values are
+    replaced by a TruncatedValue of their (bounded) repr, so errors don't keep
+    payload subtrees alive. None (the default) keeps every value.
+    """
+    global _max_value_len
+
+    if max_len is not None and max_len < 1:
+        raise ValueError(f"max_len must be positive: {max_len}")
+    _max_value_len = max_len
+    if max_len is not None:
+        _repr.maxstring = _repr.maxother = max_len
+
+
+def _retain(value: Any) -> Any:
+    max_len = _max_value_len
+    if max_len is None or value is None or type(value) in (int, float, bool):
+        return value
+    if type(value) is str:
+        if len(value) <= max_len:
+            return value
+        return TruncatedValue(value[:max_len] + "...")
+    text = _repr.repr(value)
+    if len(text) > max_len:
+        text = text[:max_len] + "..."
+    return TruncatedValue(text)
+
+
 class ValidationError:
+    __slots__ = ("keys",)
+
     keys: list[Any]
 
 
@@ -26,31 +73,36 @@ class ValidationErrors(ValueError):
 
 
 class ValidationExtraFieldError(ValidationError):
+    __slots__ = ("name", "type", "value", "expected_names")
+
     def __init__(
         self,
         name: str,
         value: Any,
-        expected_names: list[str],
+        expected_names: tuple[str, ...],
         keys: list[Any],
     ):
+        # expected_names is shared by the errors of a class, don't modify it
         self.name = name
         self.type = type(value)
-        self.value = value
+        self.value = _retain(value)
         self.expected_names = expected_names
         self.keys = keys
 
     def __str__(self):
-        return f"expected: fields={self.expected_names}; got: field={self.name} val={self.value} type={self.type}"
+        return f"expected: fields={list(self.expected_names)}; got: field={self.name} val={self.value} type={self.type}"
 
 
 class ValidationAnnotationError(ValidationError):
+    __slots__ = ("val", "type")
+
     def __init__(
         self,
         val: Any,
         type: type,
         keys: list[Any],
     ):
-        self.val = val
+        self.val = _retain(val)
         self.type = type
         self.keys = keys
 
@@ -59,6 +111,8 @@ class ValidationAnnotationError(ValidationError):
 
 
 class ValidationFieldRequiredError(ValidationError):
+    __slots__ = ("name", "type")
+
     def __init__(
         self,
         name: str,
@@ -74,13 +128,15 @@ class ValidationFieldRequiredError(ValidationError):
 
 
 class ValidationTypeError(ValidationError):
+    __slots__ = ("value", "type", "expected_type")
+
     def __init__(
         self,
         value: Any,
         expected_type: Any,
         keys: list[Any],
     ):
-        self.value = value
+        self.value = _retain(value)
         self.type = type(value)
         self.expected_type = expected_type
         self.keys = keys
@@ -90,13 +146,15 @@ class ValidationTypeError(ValidationError):
 
 
 class ValidationTypesError(ValidationError):
+    __slots__ = ("value", "type", "expected_types")
+
     def __init__(
         self,
         value: Any,
         expected_types: tuple[Any, ...],
         keys: list[Any],
     ):
-        self.value = value
+        self.value = _retain(value)
         self.type = type(value)
         self.expected_types = expected_types
         self.keys = keys
@@ -105,17 +163,53 @@ class ValidationTypesError(ValidationError):
         return f"expected: types={self.expected_types}; got: value={self.value}, type={self.type}"
 
 
+class ValidationJSONError(ValidationError):
+    __slots__ = ("msg", "pos")
+
+    def __init__(
+        self,
+        msg: str,
+        pos: int,
+        keys: list[Any],
+    ):
+        self.msg = msg
+        self.pos = pos
+        self.keys = keys
+
+    def __str__(self):
+        return f"expected: json; got: {self.msg} at char {self.pos}"
+
+
 class ValidationTupleLenError(ValidationError):
+    __slots__ = ("value", "len", "expected_len")
+
     def __init__(
         self,
         value: Any,
         expected_types: tuple[Any, ...],
         keys: list[Any],
     ):
-        self.value = value
+        self.value = _retain(value)
         self.len = len(value)
         self.expected_len = len(expected_types)
         self.keys = keys
 
     def __str__(self):
         return f"expected: tuple_len={self.expected_len}; got: tuple_len={self.len}, tuple={self.value}"
+
+
+class ValidationPatchError(ValidationError):
+    __slots__ = ("op", "msg")
+
+    def __init__(
+        self,
+        op: str,
+        msg: str,
+        keys: list[Any],
+    ):
+        self.op = op
+        self.msg = msg
+        self.keys = keys
+
+    def __str__(self):
+        return f"expected: patch op={self.op} to apply; got: {self.msg}"
@@ -0,0 +1,125 @@
+import time
+from typing import Any, Callable
+
+from .errors import ValidationError
+
+
+_Decode = Callable[[Any, int], tuple[Any, list[ValidationError]]]
+# called after every instrumented decode: (type, seconds, errors)
+Hook = Callable[[Any, float, list[ValidationError]], None]
+
+# decoders are built with or without instrumentation, so when disabled the
+# decode path has no trace of it
+enabled = False
+hook: Hook | None = None
+
+
+class _Counter:
+    __slots__ = ("calls", "errors", "time")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.time = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"calls": self.calls, "errors": self.errors, "time": self.time}
+
+
+class _UnionCounter:
+    __slots__ = ("arms", "hits", "misses")
+
+    def __init__(self, arms: tuple[Any, ...]):
+        self.arms = arms
+        self.hits = [0] * len(arms)
+        self.misses = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": sum(self.hits) + self.misses,
+            "arms": {repr(t): n for t, n in zip(self.arms, self.hits)},
+            "misses": self.misses,
+        }
+
+
+# counters by type, by (class, field name) and by union arms: distinct
+# classes of the same name (e.g. slotted twins) are counted apart, names are
+# rendered by snapshot
+_types: dict[Any, _Counter] = {}
+_fields: dict[tuple[Any, str], _Counter] = {}
+_unions: dict[Any, _UnionCounter] = {}
+
+
+def _timed(typ: Any, decode: _Decode, counter: _Counter) -> _Decode:
+    perf_counter = time.perf_counter
+
+    def timed(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        start = perf_counter()
+        res, err = decode(val, limit)
+        elapsed = perf_counter() - start
+
+        counter.calls += 1
+        counter.time += elapsed
+        if err:
+            counter.errors += 1
+        if hook is not None:
+            hook(typ, elapsed, err)
+
+        return res, err
+
+    return timed
+
+
+def _key(typ: Any) -> Any:
+    # aliases are equal regardless of the order of union arms, see _cache_key
+    if isinstance(typ, type):
+        return typ
+    return (typ, repr(typ))
+
+
+def wrap_type(typ: Any, decode: _Decode) -> _Decode:
+    counter = _types.setdefault(_key(typ), _Counter())
+    return _timed(typ, decode, counter)
+
+
+def wrap_field(cls: Any, name: str, typ: Any, decode: _Decode) -> _Decode:
+    counter = _fields.setdefault((cls, name), _Counter())
+    return _timed(typ, decode, counter)
+
+
+def union_counter(typ_args: tuple[Any, ...]) -> _UnionCounter:
+    key = (typ_args, tuple(map(repr, typ_args)))
+    return _unions.setdefault(key, _UnionCounter(typ_args))
+
+
+def _named(counters: dict[str, Any], name: str, counter: Any) -> None:
+    # distinct keys of the same name get a number
+    n = 1
+    unique = name
+    while unique in counters:
+        n += 1
+        unique = f"{name} #{n}"
+    counters[unique] = counter.snapshot()
+
+
+def snapshot() -> dict[str, Any]:
+    types: dict[str, Any] = {}
+    for k, c in _types.items():
+        _named(types, repr(k) if isinstance(k, type) else k[1], c)
+    fields: dict[str, Any] = {}
+    for (cls, name), c in _fields.items():
+        _named(fields, f"{cls.__qualname__}.{name}", c)
+    unions: dict[str, Any] = {}
+    for (_, reprs), c in _unions.items():
+        _named(unions, " | ".join(reprs), c)
+    return {"types": types, "fields": fields, "unions": unions}
+
+
+def reset() -> None:
+    for counters in (_types, _fields):
+        for c in counters.values():
+            c.calls = c.errors = 0
+            c.time = 0.0
+    for u in _unions.values():
+        u.hits[:] = [0] * len(u.arms)
+        u.misses = 0
@@ -0,0 +1,149 @@
+import sys
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Any, Callable
+
+from .errors import ValidationError
+
+
+_Decode = Callable[[Any, int], tuple[Any, list[ValidationError]]]
+
+# decoders are built with or without interning, like with instrumentation
+enabled = False
+
+
+class _Table:
+    """Canonical values, the least recently used ones are evicted first."""
+
+    __slots__ = ("max_size", "hits", "misses", "evictions", "_values")
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values: OrderedDict[Any, Any] = OrderedDict()
+
+    def get(self, val: Any, key: Any = None) -> Any:
+        """Return the canonical value for key (val itself by default), val
+        if there is none.
+
+        Raises TypeError for an unhashable key.
+        """
+        if key is None:
+            key = val
+        values = self._values
+        try:
+            canon = values[key]
+        except KeyError:
+            self.misses += 1
+            values[key] = val
+            if len(values) > self.max_size:
+                values.popitem(last=False)
+                self.evictions += 1
+            return val
+        values.move_to_end(key)
+        self.hits += 1
+        return canon
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "size": len(self._values),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+strings: _Table | None = None
+instances: _Table | None = None
+# str -> canonical str: sys.intern, or a table lookup
+intern_str: Callable[[str], str] | None = None
+
+
+def enable(max_strings: int | None, max_instances: int) -> None:
+    global enabled, strings, instances, intern_str
+
+    strings = _Table(max_strings) if max_strings else None
+    instances = _Table(max_instances) if max_instances else None
+    if max_strings is None:
+        intern_str = sys.intern
+    else:
+        intern_str = strings.get if strings is not None else None
+    enabled = True
+
+
+def disable() -> None:
+    global enabled, strings, instances, intern_str
+
+    enabled = False
+    strings = instances = intern_str = None
+
+
+def settings() -> tuple[int | None, int] | None:
+    """Return the arguments enable was called with, None if disabled."""
+    if not enabled:
+        return None
+    if intern_str is sys.intern:
+        max_strings = None
+    else:
+        max_strings = strings.max_size if strings is not None else 0
+    return max_strings, instances.max_size if instances is not None else 0
+
+
+def is_consable(typ: Any) -> bool:
+    """Return whether equal instances of typ can be shared: frozen, hashable
+    dataclasses."""
+    params = getattr(typ, "__dataclass_params__", None)
+    return params is not None and params.frozen and typ.__hash__ is not None
+
+
+def _signature(v: Any) -> Any:
+    """Return the types of a field value, which equality ignores: 1 == True,
+    (1,) == (True,). Nested consed instances are canonical already, their
+    identity tells them apart."""
+    t = type(v)
+    if t is tuple:
+        return tuple(map(_signature, v))
+    if is_consable(t):
+        return id(v)
+    return t
+
+
+def consing(typ: Any) -> Callable[[Any], Any] | None:
+    """Return what returns the canonical instance of a decoded instance of
+    typ, None if instances of typ are not shared."""
+    table = instances
+    if table is None or not is_consable(typ):
+        return None
+    names = tuple(f.name for f in fields(typ))
+
+    def cons(obj: Any) -> Any:
+        # equal instances are shared only if their field values have the
+        # same types too
+        key = (obj, tuple(_signature(getattr(obj, k)) for k in names))
+        try:
+            return table.get(obj, key)
+        except TypeError:
+            # a field holds an unhashable value
+            return obj
+
+    return cons
+
+
+def wrap_class(decode: _Decode, cons: Callable[[Any], Any]) -> _Decode:
+    def decode_consed(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        res, err = decode(val, limit)
+        if err:
+            return res, err
+        return cons(res), err
+
+    return decode_consed
+
+
+def snapshot() -> dict[str, Any]:
+    return {
+        "strings": None if strings is None else strings.snapshot(),
+        "instances": None if instances is None else instances.snapshot(),
+    }
@@ -0,0 +1,215 @@
+import enum
+import json
+from typing import Any, NamedTuple, NoReturn
+
+from .dejson import (
+    _REQUIRED,
+    _SKIP,
+    _Decode,
+    _TypeCache,
+    _accepts,
+    _class_meta,
+    _compile,
+    _compiled_caches,
+    _compiling,
+    _field_missing,
+    _is_annotated_class,
+    _limit,
+    _prefix,
+)
+from .errors import (
+    ValidationError,
+    ValidationErrors,
+    ValidationExtraFieldError,
+    ValidationFieldRequiredError,
+    ValidationTypeError,
+)
+
+
+_CONTAINERS = (dict, list, tuple, set)
+
+# how a field is decoded
+_SCALAR = 0  # when the proxy is created
+_CLASS = 1  # into a proxy, on first access
+_DEFERRED = 2  # by its decoder, on first access
+
+
+class _LazyField(NamedTuple):
+    typ: Any
+    decode: _Decode
+    missing: Any
+    kind: int
+
+
+_lazy_plans = _TypeCache()
+_compiled_caches.append(_lazy_plans)
+
+
+def _field_kind(typ: Any) -> int:
+    if _is_annotated_class(typ):
+        return _CLASS
+    if type(typ) is enum.EnumMeta:
+        return _SCALAR
+    accepts = _accepts(typ)
+    if accepts is None or any(issubclass(a, _CONTAINERS) for a in accepts):
+        return _DEFERRED
+    return _SCALAR
+
+
+def _lazy_plan(typ: Any) -> dict[str, _LazyField]:
+    try:
+        return _lazy_plans[typ]
+    except KeyError:
+        pass
+
+    with _compiling():
+        try:
+            return _lazy_plans.lookup(typ)
+        except KeyError:
+            pass
+
+        plan = {
+            k: _LazyField(t, _compile(t), _field_missing(typ, k), _field_kind(t))
+            for k, t in _class_meta(typ).types.items()
+        }
+        _lazy_plans.register(typ, plan)
+    return plan
+
+
+def _raise(root: Any, keys: list[Any], errors: list[ValidationError]) -> NoReturn:
+    for e in errors:
+        e.keys[:0] = keys
+    raise ValidationErrors(root, errors)
+
+
+class Lazy:
+    """Proxy of an annotated class instance decoded on attribute access.
+
+    Scalar fields are validated when the proxy is created. Fields of an
+    annotated class become proxies, other fields are decoded on first access
+    and cached. An invalid field raises ValidationErrors on access, with keys
+    from the root of the document.
+
+    `materialize` validates everything and returns the real instance, a field
+    named "materialize" is shadowed by it.
+    """
+
+    __slots__ = (
+        "_lazy_typ",
+        "_lazy_raw",
+        "_lazy_keys",
+        "_lazy_root",
+        "_lazy_limit",
+        "_lazy_values",
+    )
+
+    def __init__(self, typ: Any, raw: Any, keys: list[Any], root: Any, limit: int):
+        plan = _lazy_plan(typ)
+        names = _class_meta(typ).names
+        errors = []
+
+        if type(raw) is not dict:
+            _raise(root, keys, [ValidationTypeError(raw, dict, [])])
+
+        for k, v in raw.items():
+            if k not in plan:
+                errors.append(ValidationExtraFieldError(k, v, names, [k]))
+                if len(errors) >= limit:
+                    _raise(root, keys, errors)
+
+        values = {}
+        for k, f in plan.items():
+            if k in raw:
+                if f.kind != _SCALAR:
+                    continue
+                v, err = f.decode(raw[k], limit)
+                if err:
+                    errors.extend(_prefix(err, k))
+                else:
+                    values[k] = v
+            elif f.missing is _REQUIRED:
+                errors.append(ValidationFieldRequiredError(k, f.typ, [k]))
+            else:
+                continue
+            if len(errors) >= limit:
+                break
+
+        if errors:
+            _raise(root, keys, errors[:limit])
+
+        self._lazy_typ = typ
+        self._lazy_raw = raw
+        self._lazy_keys = keys
+        self._lazy_root = root
+        self._lazy_limit = limit
+        self._lazy_values = values
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith(("__", "_lazy_")):
+            # unset slots and protocol probes (copy, pickle) are no fields:
+            # looking them up as fields would recurse on an unset slot
+            raise AttributeError(name)
+
+        values = self._lazy_values
+        try:
+            return values[name]
+        except KeyError:
+            pass
+
+        f = _lazy_plan(self._lazy_typ).get(name)
+        if f is None:
+            raise AttributeError(
+                f"'{self._lazy_typ.__qualname__}' object has no attribute '{name}'"
+            )
+
+        raw = self._lazy_raw
+        keys = self._lazy_keys + [name]
+        if name not in raw:
+            if f.missing is _SKIP:
+                v = _class_meta(self._lazy_typ).fields[name].default_factory()
+            else:
+                v = f.missing
+        elif f.kind == _CLASS:
+            v = Lazy(f.typ, raw[name], keys, self._lazy_root, self._lazy_limit)
+        else:
+            v, err = f.decode(raw[name], self._lazy_limit)
+            if err:
+                _raise(self._lazy_root, keys, err[: self._lazy_limit])
+
+        values[name] = v
+        return v
+
+    def __repr__(self):
+        return f"Lazy({self._lazy_typ.__qualname__})"
+
+    def materialize(self) -> Any:
+        """Validate every field and return the decoded instance."""
+        limit = self._lazy_limit
+        res, err = _compile(self._lazy_typ)(self._lazy_raw, limit)
+        if err:
+            _raise(self._lazy_root, self._lazy_keys, err[:limit])
+        return res
+
+
+def from_object_lazy(
+    val: Any, typ: Any, *, fail_fast: bool = False, max_errors: int | None = None
+) -> Lazy:
+    """Return a `Lazy` proxy of the annotated class typ over val.
+
+    Only the scalar fields of the top-level object are validated here, the
+    rest when it is accessed or on `Lazy.materialize`.
+    """
+    if not _is_annotated_class(typ):
+        raise Exception(f"unsupported type: {typ}")
+    return Lazy(typ, val, [], typ, _limit(fail_fast, max_errors))
+
+
+def from_json_lazy(
+    s: str | bytes | bytearray,
+    typ: Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> Lazy:
+    d = json.loads(s)
+    return from_object_lazy(d, typ, fail_fast=fail_fast, max_errors=max_errors)
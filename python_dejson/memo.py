@@ -0,0 +1,80 @@
+import json
+from collections import OrderedDict
+from typing import Any, Callable
+
+from .errors import ValidationError
+
+
+_Decode = Callable[[Any, int], tuple[Any, list[ValidationError]]]
+
+
+class _Memo:
+    """Decoded instances keyed by their payload in canonical json, the least
+    recently used ones are evicted first."""
+
+    __slots__ = ("max_entries", "max_bytes", "size", "hits", "misses", "_items")
+
+    def __init__(self, max_entries: int, max_bytes: int | None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # total length of the keys, the payloads in canonical json
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        items = self._items
+        try:
+            res = items[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        items.move_to_end(key)
+        self.hits += 1
+        return res
+
+    def put(self, key: str, res: Any) -> None:
+        items = self._items
+        if key in items:
+            return
+        items[key] = res
+        self.size += len(key)
+        while len(items) > self.max_entries or (
+            self.max_bytes is not None and self.size > self.max_bytes
+        ):
+            k, _ = items.popitem(last=False)
+            self.size -= len(k)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.size = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._items),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def wrap_class(decode: _Decode, memo: _Memo) -> _Decode:
+    def decode_memo(val: Any, limit: int) -> tuple[Any, list[ValidationError]]:
+        if type(val) is not dict:
+            return decode(val, limit)
+        # equal payloads whatever their key order, and payloads of json
+        # types only: 1, 1.0 and True differ, other values aren't cached
+        try:
+            key = json.dumps(val, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return decode(val, limit)
+        res = memo.get(key)
+        if res is not None:
+            return res, []
+        res, err = decode(val, limit)
+        if not err:
+            memo.put(key, res)
+        return res, err
+
+    return decode_memo
@@ -0,0 +1,150 @@
+import os
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Sequence, get_args, get_origin
+
+from .dejson import (
+    _apply_settings,
+    _compile,
+    _from_objects,
+    _limit,
+    _prefix,
+    _settings,
+    from_object,
+)
+from .errors import ValidationError, ValidationErrors
+
+
+# below this many items the pool costs more than it saves
+MIN_PARALLEL = 20000
+# items per task: small chunks make the pickling of tasks dominate
+MIN_CHUNK_SIZE = 2000
+# tasks per worker, to even out chunks that decode slower than others
+CHUNKS_PER_WORKER = 4
+
+
+def _chunk_size(n: int, workers: int) -> int:
+    return max(MIN_CHUNK_SIZE, -(-n // (workers * CHUNKS_PER_WORKER)))
+
+
+def _decode_chunk(
+    typ: Any, vals: Sequence[Any], limit: int, settings: tuple[Any, ...]
+) -> tuple[list[Any], list[list[ValidationError]]]:
+    # runs in a worker process, the decoder is compiled once per worker and
+    # again only when the settings of the caller changed
+    _apply_settings(settings)
+    return _from_objects(_compile(typ), vals, limit)
+
+
+def _map_chunks(
+    vals: Sequence[Any],
+    typ: Any,
+    executor: Executor,
+    chunk_size: int,
+    limit: int,
+    stop: int,
+) -> tuple[list[Any], list[list[ValidationError]]]:
+    settings = _settings()
+    futures: list[Future] = [
+        executor.submit(_decode_chunk, typ, vals[i : i + chunk_size], limit, settings)
+        for i in range(0, len(vals), chunk_size)
+    ]
+
+    results: list[Any] = []
+    errors: list[list[ValidationError]] = []
+    count = 0
+    for i, future in enumerate(futures):
+        res, err = future.result()
+        results.extend(res)
+        errors.extend(err)
+        count += sum(map(len, err))
+        if count >= stop:
+            for f in futures[i + 1 :]:
+                f.cancel()
+            break
+
+    return results, errors
+
+
+def _run(
+    vals: Sequence[Any],
+    typ: Any,
+    executor: Executor | None,
+    workers: int | None,
+    chunk_size: int | None,
+    limit: int,
+    stop: int,
+) -> tuple[list[Any], list[list[ValidationError]]]:
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or _chunk_size(len(vals), workers)
+
+    if executor is not None:
+        return _map_chunks(vals, typ, executor, chunk_size, limit, stop)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _map_chunks(vals, typ, executor, chunk_size, limit, stop)
+
+
+def from_objects_parallel(
+    vals: Sequence[Any],
+    typ: Any,
+    *,
+    executor: Executor | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    min_parallel: int = MIN_PARALLEL,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> tuple[list[Any], list[list[ValidationError]]]:
+    """Like `from_objects`, but decode chunks of vals in a process pool.
+
+    typ and vals must be picklable. Pass a long-lived executor to avoid
+    starting a pool per call, workers then only sizes the chunks. Batches
+    shorter than min_parallel are decoded in this process.
+
+    The workers decode with the backend, constructions, interning and
+    memoized classes set in this process (trusted and memoized classes must
+    be picklable too). Stats are not collected in the workers.
+    """
+    limit = _limit(fail_fast, max_errors)
+    if len(vals) < min_parallel:
+        return _from_objects(_compile(typ), vals, limit)
+    return _run(vals, typ, executor, workers, chunk_size, limit, sys.maxsize)
+
+
+def from_object_parallel(
+    val: Any,
+    typ: Any,
+    *,
+    executor: Executor | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    min_parallel: int = MIN_PARALLEL,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> Any:
+    """Like `from_object`, but decode a large top-level list in a process pool.
+
+    typ must be `list[T]`, anything else is decoded in this process. Error
+    keys hold indices into the whole list and the order of items is kept.
+    The workers decode like `from_objects_parallel` ones.
+    """
+    if (
+        get_origin(typ) is not list
+        or type(val) not in (list, tuple)
+        or len(val) < min_parallel
+    ):
+        return from_object(val, typ, fail_fast=fail_fast, max_errors=max_errors)
+
+    limit = _limit(fail_fast, max_errors)
+    (t,) = get_args(typ)
+    results, errors = _run(val, t, executor, workers, chunk_size, limit, limit)
+
+    all_errors = []
+    for i, err in enumerate(errors):
+        if err:
+            all_errors.extend(_prefix(err, i))
+    if all_errors:
+        raise ValidationErrors(typ, all_errors[:limit])
+
+    return results
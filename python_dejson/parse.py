@@ -0,0 +1,312 @@
+import json
+import re
+from json.decoder import WHITESPACE, scanstring
+from typing import Any, Callable, get_args, get_origin
+
+from . import interning
+from .dejson import (
+    _REQUIRED,
+    _SKIP,
+    _Decode,
+    _TypeCache,
+    _cache_key,
+    _class_meta,
+    _compile,
+    _compiled_caches,
+    _compiling,
+    _constructor,
+    _field_missing,
+    _is_annotated_class,
+    _prefix,
+)
+from .errors import (
+    ValidationError,
+    ValidationExtraFieldError,
+    ValidationFieldRequiredError,
+)
+
+
+# Type-directed parsing: JSON objects decoded into annotated classes, and the
+# lists and dicts holding them, are parsed here field by field and the class
+# is built as soon as its object ends, so their dicts are never created.
+# Everything else is parsed by the C scanner of the json module and checked
+# by the compiled decoder, as in the two-pass from_json.
+_Parse = Callable[[str, int, int], tuple[Any, list[ValidationError], int]]
+
+_scan = json.JSONDecoder().scan_once
+
+# a key without escapes and its ":", and the "," or closing char after an
+# item, each with the whitespace around it, matched in one call
+_KEY = re.compile(r'[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*')
+_OBJECT_SEP = re.compile(r"[ \t\n\r]*([,}])[ \t\n\r]*")
+_ARRAY_SEP = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+# None: no typed parser, scan and decode the value
+_parsers = _TypeCache()
+_compiled_caches.append(_parsers)
+
+
+class _Duplicate(Exception):
+    """A JSON object repeats a key: the last value wins but the first position
+    counts for its errors, the two-pass decode is used to get it right."""
+
+
+def _ws(s: str, idx: int) -> int:
+    return WHITESPACE.match(s, idx).end()
+
+
+def _raw(s: str, idx: int) -> tuple[Any, int]:
+    try:
+        return _scan(s, idx)
+    except StopIteration as e:
+        raise json.JSONDecodeError("Expecting value", s, e.value) from None
+
+
+def _key(s: str, idx: int) -> tuple[str, int]:
+    """Parse an object key and its ":", return the index of the value."""
+    m = _KEY.match(s, idx)
+    if m is not None:
+        return m[1], m.end()
+
+    idx = _ws(s, idx)
+    if s[idx : idx + 1] != '"':
+        raise json.JSONDecodeError(
+            "Expecting property name enclosed in double quotes", s, idx
+        )
+    k, idx = scanstring(s, idx + 1)
+    idx = _ws(s, idx)
+    if s[idx : idx + 1] != ":":
+        raise json.JSONDecodeError("Expecting ':' delimiter", s, idx)
+    return k, _ws(s, idx + 1)
+
+
+def _next(s: str, idx: int, sep: re.Pattern) -> tuple[bool, int]:
+    """Parse the "," or the closing char after an item, return whether an item
+    follows and the index after it."""
+    m = sep.match(s, idx)
+    if m is None:
+        raise json.JSONDecodeError("Expecting ',' delimiter", s, _ws(s, idx))
+    return m[1] == ",", m.end()
+
+
+def _scan_decode(typ: Any) -> _Parse:
+    decode = _compile(typ)
+
+    def parse(s: str, idx: int, limit: int) -> tuple[Any, list[ValidationError], int]:
+        val, end = _raw(s, idx)
+        res, err = decode(val, limit)
+        return res, err, end
+
+    return parse
+
+
+def _parse_annotated_class(typ: Any) -> _Parse:
+    types = _class_meta(typ).types
+    expected_names = _class_meta(typ).names
+    missing = {k: _field_missing(typ, k) for k in types}
+    construct = _constructor(typ)
+    cons = interning.consing(typ)
+    scan_decode = _scan_decode(typ)
+
+    # filled after the parser is cached, for self-referencing classes:
+    # the typed parser of a field, or None and its decoder
+    fields: dict[str, tuple[_Parse | None, _Decode]] = {}
+
+    def parse(s: str, idx: int, limit: int) -> tuple[Any, list[ValidationError], int]:
+        if s[idx : idx + 1] != "{":
+            return scan_decode(s, idx, limit)
+
+        found: dict[str, tuple[Any, list[ValidationError]]] = {}
+        extras: dict[str, Any] = {}
+
+        idx = _ws(s, idx + 1)
+        more = s[idx : idx + 1] != "}"
+        if not more:
+            idx += 1
+        while more:
+            k, idx = _key(s, idx)
+            if k in found or k in extras:
+                raise _Duplicate()
+            field = fields.get(k)
+            if field is None:
+                extras[k], idx = _raw(s, idx)
+            elif field[0] is None:
+                v, idx = _raw(s, idx)
+                found[k] = field[1](v, limit)
+            else:
+                v, err, idx = field[0](s, idx, limit)
+                found[k] = (v, err)
+            more, idx = _next(s, idx, _OBJECT_SEP)
+
+        # same order and limits as the class decoder
+        errors = []
+        for k, v in extras.items():
+            errors.append(ValidationExtraFieldError(k, v, expected_names, [k]))
+            if len(errors) >= limit:
+                return None, errors, idx
+
+        attrs = {}
+        for k, t in types.items():
+            if k in found:
+                v, err = found[k]
+                if err:
+                    errors.extend(_prefix(err, k))
+                    if len(errors) >= limit:
+                        break
+                else:
+                    attrs[k] = v
+            elif missing[k] is _REQUIRED:
+                errors.append(ValidationFieldRequiredError(k, t, [k]))
+                if len(errors) >= limit:
+                    break
+            elif missing[k] is not _SKIP:
+                attrs[k] = missing[k]
+
+        if errors:
+            return None, errors, idx
+        obj = typ(**attrs) if construct is None else construct(attrs)
+        if cons is not None:
+            obj = cons(obj)
+        return obj, errors, idx
+
+    key = _cache_key(typ)
+    _parsers.register(key, parse)
+    try:
+        for k, t in types.items():
+            fields[k] = (_parser(t), _compile(t))
+    except BaseException:
+        _parsers.unregister(key)
+        raise
+
+    return parse
+
+
+def _parse_list(typ: Any, elem_parse: _Parse) -> _Parse:
+    scan_decode = _scan_decode(typ)
+
+    def parse(s: str, idx: int, limit: int) -> tuple[Any, list[ValidationError], int]:
+        if s[idx : idx + 1] != "[":
+            return scan_decode(s, idx, limit)
+
+        res = []
+        errors = []
+        k = 0
+
+        idx = _ws(s, idx + 1)
+        more = s[idx : idx + 1] != "]"
+        if not more:
+            idx += 1
+        while more:
+            if len(errors) >= limit:
+                # the list decoder would stop here, only check the syntax
+                _, idx = _raw(s, idx)
+            else:
+                v, err, idx = elem_parse(s, idx, limit)
+                if err:
+                    errors.extend(_prefix(err, k))
+                else:
+                    res.append(v)
+            k += 1
+            more, idx = _next(s, idx, _ARRAY_SEP)
+
+        return res, errors, idx
+
+    return parse
+
+
+def _parse_dict(typ: Any, value_parse: _Parse) -> _Parse:
+    scan_decode = _scan_decode(typ)
+    key_decode = _compile(get_args(typ)[0])
+
+    def parse(s: str, idx: int, limit: int) -> tuple[Any, list[ValidationError], int]:
+        if s[idx : idx + 1] != "{":
+            return scan_decode(s, idx, limit)
+
+        res = {}
+        errors = []
+        seen = set()
+
+        idx = _ws(s, idx + 1)
+        more = s[idx : idx + 1] != "}"
+        if not more:
+            idx += 1
+        while more:
+            k, idx = _key(s, idx)
+            if k in seen:
+                raise _Duplicate()
+            seen.add(k)
+            if len(errors) >= limit:
+                _, idx = _raw(s, idx)
+            else:
+                rk, err_k = key_decode(k, limit)
+                rv, err_v, idx = value_parse(s, idx, limit)
+                if err_k or err_v:
+                    errors.extend(_prefix(err_k, k))
+                    errors.extend(_prefix(err_v, k))
+                else:
+                    res[rk] = rv
+            more, idx = _next(s, idx, _OBJECT_SEP)
+
+        return res, errors, idx
+
+    return parse
+
+
+def _build_parser(typ: Any) -> _Parse | None:
+    if _is_annotated_class(typ):
+        return _parse_annotated_class(typ)
+
+    typ_orig = get_origin(typ)
+    typ_args = get_args(typ)
+
+    if typ_orig is list and len(typ_args) == 1:
+        elem_parse = _parser(typ_args[0])
+        if elem_parse is not None:
+            return _parse_list(typ, elem_parse)
+
+    if typ_orig is dict and len(typ_args) == 2:
+        value_parse = _parser(typ_args[1])
+        if value_parse is not None:
+            return _parse_dict(typ, value_parse)
+
+    return None
+
+
+def _parser(typ: Any) -> _Parse | None:
+    try:
+        key = _cache_key(typ)
+        return _parsers[key]
+    except KeyError:
+        pass
+    except TypeError:
+        with _compiling():
+            return _build_parser(typ)
+
+    with _compiling():
+        try:
+            return _parsers.lookup(key)
+        except KeyError:
+            pass
+
+        parse = _build_parser(typ)
+        _parsers.register(key, parse)
+    return parse
+
+
+def parse(
+    s: str | bytes | bytearray, typ: Any, limit: int
+) -> tuple[Any, list[ValidationError]]:
+    """Parse and decode s into typ in one pass.
+
+    Raises _Duplicate when an object repeats a key and json.JSONDecodeError
+    for invalid JSON.
+    """
+    if not isinstance(s, str):
+        s = s.decode(json.detect_encoding(s), "surrogatepass")
+
+    typ_parse = _parser(typ) or _scan_decode(typ)
+    res, err, idx = typ_parse(s, _ws(s, 0), limit)
+    end = _ws(s, idx)
+    if end != len(s):
+        raise json.JSONDecodeError("Extra data", s, end)
+    return res, err
@@ -0,0 +1,405 @@
+from types import UnionType
+from typing import Annotated, Any, Callable, Union, get_args, get_origin
+
+from .dejson import (
+    _REQUIRED,
+    _SKIP,
+    _TypeCache,
+    _cache_key,
+    _class_meta,
+    _compile,
+    _compiled_caches,
+    _compiling,
+    _constructor,
+    _field_missing,
+    _is_annotated_class,
+    _limit,
+)
+from .encode import _union_arm, to_object
+from .errors import (
+    ValidationError,
+    ValidationErrors,
+    ValidationExtraFieldError,
+    ValidationFieldRequiredError,
+    ValidationPatchError,
+)
+
+
+# Patches are applied copy-on-write: only the objects on the path from the
+# root to a change are rebuilt, every other subtree of obj is reused as is,
+# and only the new values are validated.
+
+# decodes the value of an op for its target type and keys
+_Provide = Callable[[Any, list[Any]], Any]
+
+
+# the value of a dict key to remove, in changes
+_REMOVED = object()
+
+_builders = _TypeCache()
+_compiled_caches.append(_builders)
+
+
+def _builder(typ: Any) -> Callable[[dict[str, Any]], Any]:
+    """Return what builds an instance of the annotated class typ from a dict
+    of its fields."""
+    try:
+        return _builders[typ]
+    except KeyError:
+        pass
+
+    with _compiling():
+        construct = _constructor(typ)
+        if construct is None:
+
+            def construct(attrs: dict[str, Any]) -> Any:
+                return typ(**attrs)
+
+        _builders.register(typ, construct)
+    return construct
+
+
+class _Failed(Exception):
+    def __init__(self, errors: list[ValidationError]):
+        self.errors = errors
+
+
+def _fail(op: str, msg: str, keys: list[Any]) -> _Failed:
+    return _Failed([ValidationPatchError(op, msg, list(keys))])
+
+
+def _decode(val: Any, typ: Any, keys: list[Any], limit: int) -> Any:
+    res, err = _compile(typ)(val, limit)
+    if err:
+        for e in err:
+            e.keys[:0] = keys
+        raise _Failed(err[:limit])
+    return res
+
+
+def _pointer(path: Any, op: str) -> list[str]:
+    if path == "":
+        return []
+    if type(path) is not str or not path.startswith("/"):
+        raise _fail(op, f"invalid path {path!r}", [])
+    return [t.replace("~1", "/").replace("~0", "~") for t in path[1:].split("/")]
+
+
+def _resolve(typ: Any, cur: Any, op: str, keys: list[Any]) -> Any:
+    """Strip Annotated from typ and pick the union arm cur was decoded with."""
+    while True:
+        typ_orig = get_origin(typ)
+        if typ_orig is Annotated:
+            typ = get_args(typ)[0]
+        elif typ_orig in (UnionType, Union):
+            typ_args = get_args(typ)
+            try:
+                typ = typ_args[_union_arm(cur, typ_args)]
+            except Exception:
+                raise _fail(op, f"no union arm for {type(cur)}", keys) from None
+        else:
+            return typ
+
+
+def _is_list(typ: Any) -> bool:
+    typ_args = get_args(typ)
+    return get_origin(typ) is list or (
+        get_origin(typ) is tuple and len(typ_args) == 2 and typ_args[1] is Ellipsis
+    )
+
+
+class _Node:
+    """A decoded object on the path, addressed by pointer tokens."""
+
+    def __init__(self, cur: Any, typ: Any, op: str, keys: list[Any], limit: int):
+        self.cur = cur
+        self.typ = typ
+        self.op = op
+        self.keys = keys
+        self.limit = limit
+
+        if _is_annotated_class(typ):
+            self.kind = "class"
+        elif _is_list(typ):
+            self.kind = "list"
+        elif get_origin(typ) is tuple:
+            self.kind = "tuple"
+        elif get_origin(typ) is dict:
+            self.kind = "dict"
+        else:
+            raise _fail(op, f"no members in a value of {typ}", keys)
+
+    def child(self, tok: str, append: bool = False) -> tuple[Any, Any, Any]:
+        """Return the key of tok in cur, the type of its value and the key
+        of errors."""
+        if self.kind == "class":
+            types = _class_meta(self.typ).types
+            if tok not in types:
+                raise _Failed(
+                    [
+                        ValidationExtraFieldError(
+                            tok, None, _class_meta(self.typ).names, self.keys + [tok]
+                        )
+                    ]
+                )
+            return tok, types[tok], tok
+
+        if self.kind == "dict":
+            kt, vt = get_args(self.typ)
+            k, err = _compile(kt)(tok, self.limit)
+            if err:
+                for e in err:
+                    e.keys[:0] = self.keys + [tok]
+                raise _Failed(err[: self.limit])
+            return k, vt, tok
+
+        n = len(self.cur)
+        if append and tok == "-":
+            i = n
+        elif tok.isdigit() and (tok == "0" or not tok.startswith("0")):
+            i = int(tok)
+        else:
+            raise _fail(self.op, f"invalid index {tok!r}", self.keys)
+        if i > n or (i == n and not append):
+            raise _fail(self.op, f"index {i} out of range", self.keys + [i])
+
+        typ_args = get_args(self.typ)
+        return i, typ_args[0] if self.kind == "list" else typ_args[i], i
+
+    def get(self, key: Any, err_key: Any) -> Any:
+        if self.kind == "class":
+            return getattr(self.cur, key)
+        try:
+            return self.cur[key]
+        except (KeyError, IndexError):
+            raise _fail(self.op, "no value at path", self.keys + [err_key]) from None
+
+    def _sequence(self, items: list[Any]) -> Any:
+        return items if get_origin(self.typ) is list else tuple(items)
+
+    def update(self, changes: dict[Any, Any]) -> Any:
+        """Return a copy of a class or dict cur with changes, _REMOVED
+        values remove dict keys (absent ones too)."""
+        if self.kind == "class":
+            attrs = {k: getattr(self.cur, k) for k in _class_meta(self.typ).types}
+            attrs.update(changes)
+            return _builder(self.typ)(attrs)
+
+        res = dict(self.cur)
+        for k, v in changes.items():
+            if v is _REMOVED:
+                res.pop(k, None)
+            else:
+                res[k] = v
+        return res
+
+    def missing(self, key: Any) -> Any:
+        """Return what a field gets when it is removed: like a field missing
+        from the payload."""
+        missing = _field_missing(self.typ, key)
+        if missing is _REQUIRED:
+            t = _class_meta(self.typ).types[key]
+            raise _Failed([ValidationFieldRequiredError(key, t, self.keys + [key])])
+        if missing is _SKIP:
+            return _class_meta(self.typ).fields[key].default_factory()
+        return missing
+
+    def set(self, key: Any, value: Any, insert: bool = False) -> Any:
+        if self.kind in ("class", "dict"):
+            return self.update({key: value})
+
+        if insert and self.kind == "tuple":
+            raise _fail(self.op, "fixed tuple length", self.keys + [key])
+        items = list(self.cur)
+        if insert:
+            items.insert(key, value)
+        else:
+            items[key] = value
+        return self._sequence(items)
+
+    def remove(self, key: Any, err_key: Any) -> Any:
+        if self.kind == "class":
+            return self.update({key: self.missing(key)})
+
+        self.get(key, err_key)
+        if self.kind == "dict":
+            return self.update({key: _REMOVED})
+
+        if self.kind == "tuple":
+            raise _fail(self.op, "fixed tuple length", self.keys + [key])
+        items = list(self.cur)
+        del items[key]
+        return self._sequence(items)
+
+
+def _lookup(
+    cur: Any, typ: Any, tokens: list[str], op: str, limit: int
+) -> tuple[Any, Any, list[Any]]:
+    keys: list[Any] = []
+    for tok in tokens:
+        node = _Node(cur, _resolve(typ, cur, op, keys), op, keys, limit)
+        key, typ, err_key = node.child(tok)
+        cur = node.get(key, err_key)
+        keys = keys + [err_key]
+    return cur, typ, keys
+
+
+def _edit(
+    cur: Any,
+    typ: Any,
+    tokens: list[str],
+    kind: str,
+    provide: _Provide | None,
+    op: str,
+    keys: list[Any],
+    limit: int,
+) -> Any:
+    """Return cur with the change of kind at tokens: add, replace or remove."""
+    node = _Node(cur, _resolve(typ, cur, op, keys), op, keys, limit)
+    tok = tokens[0]
+
+    if len(tokens) > 1:
+        key, child_typ, err_key = node.child(tok)
+        child = node.get(key, err_key)
+        new = _edit(
+            child, child_typ, tokens[1:], kind, provide, op, keys + [err_key], limit
+        )
+        return node.set(key, new)
+
+    if kind == "add":
+        key, child_typ, err_key = node.child(tok, append=node.kind != "class")
+        insert = node.kind in ("list", "tuple")
+        return node.set(key, provide(child_typ, keys + [err_key]), insert)
+
+    key, child_typ, err_key = node.child(tok)
+    if kind == "remove":
+        return node.remove(key, err_key)
+
+    node.get(key, err_key)
+    return node.set(key, provide(child_typ, keys + [err_key]))
+
+
+def _apply_op(obj: Any, typ: Any, op: Any, limit: int) -> Any:
+    if type(op) is not dict or type(op.get("op")) is not str:
+        raise _fail("?", f"invalid op {op!r}", [])
+    name = op["op"]
+    tokens = _pointer(op.get("path"), name)
+
+    if name in ("add", "replace", "test"):
+        if "value" not in op:
+            raise _fail(name, "no value", [])
+        value = op["value"]
+
+        def provide(t: Any, keys: list[Any]) -> Any:
+            return _decode(value, t, keys, limit)
+
+    elif name in ("move", "copy"):
+        src_tokens = _pointer(op.get("from"), name)
+        if name == "move" and tokens[: len(src_tokens)] == src_tokens:
+            if len(tokens) > len(src_tokens):
+                raise _fail(name, "move into its own child", [])
+            return obj
+        src, src_typ, _ = _lookup(obj, typ, src_tokens, name, limit)
+
+        def provide(t: Any, keys: list[Any]) -> Any:
+            if _cache_key(t) == _cache_key(src_typ):
+                return src
+            return _decode(to_object(src, src_typ), t, keys, limit)
+
+        if name == "move":
+            obj = _edit(obj, typ, src_tokens, "remove", provide, name, [], limit)
+        name = "add"
+
+    elif name == "remove":
+        provide = None
+
+    else:
+        raise _fail(name, "unsupported op", [])
+
+    if name == "test":
+        cur, cur_typ, keys = _lookup(obj, typ, tokens, name, limit)
+        if provide(cur_typ, keys) != cur:
+            raise _fail(name, "values differ", keys)
+        return obj
+
+    if not tokens:
+        if name == "remove":
+            raise _fail(name, "can't remove the root", [])
+        return provide(typ, [])
+
+    return _edit(obj, typ, tokens, name, provide, name, [], limit)
+
+
+def _merged(patch: Any) -> Any:
+    """Return patch merged into no object: without its null members,
+    recursively."""
+    if type(patch) is not dict:
+        return patch
+    return {k: _merged(v) for k, v in patch.items() if v is not None}
+
+
+def _merge(cur: Any, typ: Any, patch: Any, keys: list[Any], limit: int) -> Any:
+    """Apply a merge patch (RFC 7386) to cur of typ."""
+    if type(patch) is not dict:
+        return _decode(patch, typ, keys, limit)
+
+    try:
+        node = _Node(cur, _resolve(typ, cur, "merge", keys), "merge", keys, limit)
+    except _Failed:
+        # not an object (e.g. None): the patch is merged into {}
+        return _decode(_merged(patch), typ, keys, limit)
+    if node.kind not in ("class", "dict"):
+        return _decode(_merged(patch), typ, keys, limit)
+
+    # the object is rebuilt once, with the changes of all members
+    changes: dict[Any, Any] = {}
+    errors: list[ValidationError] = []
+    for tok, v in patch.items():
+        try:
+            key, child_typ, err_key = node.child(tok)
+            if v is None:
+                # removing an absent dict key is a no-op
+                changes[key] = _REMOVED if node.kind == "dict" else node.missing(key)
+            elif node.kind == "class" or key in node.cur:
+                child = node.get(key, err_key)
+                changes[key] = _merge(child, child_typ, v, keys + [err_key], limit)
+            else:
+                changes[key] = _decode(_merged(v), child_typ, keys + [err_key], limit)
+        except _Failed as e:
+            errors.extend(e.errors)
+            if len(errors) >= limit:
+                break
+
+    if errors:
+        raise _Failed(errors[:limit])
+    return node.update(changes)
+
+
+def apply_patch(
+    obj: Any,
+    typ: Any,
+    patch: Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> Any:
+    """Return obj of typ with patch applied, validating only what changed.
+
+    patch is a JSON Patch (RFC 6902, a list of ops) or a merge patch
+    (RFC 7386, a dict). Only the objects on the paths to the changes are
+    rebuilt, copy-on-write: obj is not modified and its untouched subtrees
+    are shared with the result. Removing a field of an annotated class sets
+    its default, like a field missing from the payload.
+
+    The patch applies whole or not at all: the first failing op raises
+    ValidationErrors with keys from the root of obj.
+    """
+    limit = _limit(fail_fast, max_errors)
+    try:
+        if type(patch) is list:
+            for op in patch:
+                obj = _apply_op(obj, typ, op, limit)
+            return obj
+        return _merge(obj, typ, patch, [], limit)
+    except _Failed as e:
+        raise ValidationErrors(typ, e.errors) from None
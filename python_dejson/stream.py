@@ -0,0 +1,354 @@
+import codecs
+import itertools
+import json
+import mmap
+import os
+import re
+from typing import IO, Any, Callable, Iterable, Iterator, get_args
+
+from .dejson import _Decode, _compile, _limit, _prefix
+from .errors import ValidationError, ValidationErrors, ValidationJSONError
+
+
+_WS = " \t\n\r"
+# what ends a number or a literal in an array
+_DELIM = re.compile(r"[ \t\n\r,\]]")
+# how much of a malformed array item is buffered before it is raised
+_MAX_PENDING = 1 << 26
+_json_decoder = json.JSONDecoder()
+
+# states of a top-level JSON array
+_OPEN = 0  # expect "["
+_FIRST = 1  # expect a value or "]"
+_VALUE = 2  # expect a value
+_SEP = 3  # expect "," or "]"
+_END = 4  # expect nothing but whitespace
+
+
+class _Splitter:
+    """Split text chunks into the records of NDJSON or of a top-level JSON array.
+
+    Records are returned parsed, a malformed NDJSON line is returned as its
+    json.JSONDecodeError. A malformed array can't be resynchronized, so its
+    errors are raised. Only the unparsed tail of the input is kept in memory.
+    """
+
+    def __init__(self, format: str = "auto", max_pending: int = _MAX_PENDING):
+        if format not in ("auto", "ndjson", "array"):
+            raise ValueError(f"unsupported format: {format}")
+        self.format = format
+        # a malformed array item is raised once this much of it is buffered
+        self.max_pending = max_pending
+        # the unparsed tail of the input, joined only when it is parsed
+        self._chunks: list[str] = []
+        self._size = 0
+        self._state = _OPEN
+        # the position (char, line and column) of the start of the tail
+        self._consumed = 0
+        self._lineno = 1
+        self._colno = 1
+        # an incomplete array item is parsed again only after the buffer
+        # doubled, so a large item is not parsed once per chunk
+        self._retry = 0
+
+    def feed(self, chunk: str) -> list[Any]:
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self.format == "ndjson" and "\n" not in chunk:
+            return []
+        if self.format == "array" and self._size < self._retry:
+            return []
+        return self._split(False)
+
+    def close(self) -> list[Any]:
+        items = self._split(True)
+        if self.format == "array" and self._state != _END:
+            buf = self._take()
+            raise self._error("Expecting ']'", buf, len(buf))
+        return items
+
+    def _take(self) -> str:
+        buf = "".join(self._chunks)
+        self._chunks = []
+        self._size = 0
+        return buf
+
+    def _keep(self, buf: str, pos: int) -> None:
+        # where the kept tail starts in the whole input
+        self._consumed += pos
+        lines = buf.count("\n", 0, pos)
+        if lines:
+            self._lineno += lines
+            self._colno = pos - buf.rfind("\n", 0, pos)
+        else:
+            self._colno += pos
+
+        if pos < len(buf):
+            self._chunks = [buf[pos:]]
+            self._size = len(buf) - pos
+
+    def _split(self, eof: bool) -> list[Any]:
+        buf = self._take()
+        if self.format == "auto":
+            stripped = buf.lstrip(_WS)
+            if not stripped:
+                self._keep(buf, len(buf))
+                return []
+            self.format = "array" if stripped[0] == "[" else "ndjson"
+
+        if self.format == "ndjson":
+            return self._split_lines(buf, eof)
+        try:
+            return self._split_array(buf, eof)
+        except json.JSONDecodeError as e:
+            raise self._error(e.msg, buf, e.pos) from None
+
+    def _error(self, msg: str, buf: str, pos: int) -> json.JSONDecodeError:
+        """Return the error at pos of the tail buf, positioned in the whole
+        input (doc is only the tail)."""
+        err = json.JSONDecodeError(msg, buf, pos)
+        err.pos = self._consumed + pos
+        if "\n" not in buf[:pos]:
+            err.lineno = self._lineno
+            err.colno = self._colno + pos
+        else:
+            err.lineno = self._lineno + buf.count("\n", 0, pos)
+        err.args = (f"{msg}: line {err.lineno} column {err.colno} (char {err.pos})",)
+        return err
+
+    def _split_lines(self, buf: str, eof: bool) -> list[Any]:
+        items = []
+        pos = 0
+
+        while True:
+            i = buf.find("\n", pos)
+            if i >= 0:
+                line = buf[pos:i]
+                pos = i + 1
+            elif eof:
+                line = buf[pos:]
+                pos = len(buf)
+            else:
+                break
+
+            if line.strip(_WS):
+                try:
+                    items.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    items.append(e)
+
+            if i < 0:
+                break
+
+        self._keep(buf, pos)
+        return items
+
+    def _split_array(self, buf: str, eof: bool) -> list[Any]:
+        items = []
+        n = len(buf)
+        pos = 0
+
+        while True:
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            if pos == n:
+                break
+
+            state = self._state
+            c = buf[pos]
+
+            if state == _OPEN:
+                if c != "[":
+                    raise json.JSONDecodeError("Expecting '['", buf, pos)
+                pos += 1
+                self._state = _FIRST
+
+            elif state == _FIRST and c == "]":
+                pos += 1
+                self._state = _END
+
+            elif state in (_FIRST, _VALUE):
+                if not eof and n - pos < self._retry:
+                    break
+                try:
+                    item, end = _json_decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof or n - pos > self.max_pending:
+                        raise
+                    self._retry = 2 * (n - pos)
+                    break
+                if not eof and c not in '{["' and not _DELIM.search(buf, end):
+                    # a number may continue in the next chunk ("1." and "1e"
+                    # are read as 1)
+                    self._retry = 2 * (n - pos)
+                    break
+                items.append(item)
+                pos = end
+                self._state = _SEP
+                self._retry = 0
+
+            elif state == _SEP:
+                if c == ",":
+                    self._state = _VALUE
+                elif c == "]":
+                    self._state = _END
+                else:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+                pos += 1
+
+            else:
+                raise json.JSONDecodeError("Extra data", buf, pos)
+
+        self._keep(buf, pos)
+        return items
+
+
+def _decode_record(
+    raw: Any, index: int, decode: _Decode, typ: Any, limit: int
+) -> tuple[Any, ValidationErrors | None]:
+    if isinstance(raw, json.JSONDecodeError):
+        err = [ValidationJSONError(raw.msg, raw.pos, [index])]
+        return None, ValidationErrors(typ, err)
+
+    res, err = decode(raw, limit)
+    if err:
+        return None, ValidationErrors(typ, _prefix(err[:limit], index))
+
+    return res, None
+
+
+class _Records:
+    """Decode split records one at a time, numbering them from 0."""
+
+    def __init__(
+        self,
+        typ: Any,
+        skip_invalid: bool,
+        on_error: Callable[[ValidationErrors], None] | None,
+        fail_fast: bool,
+        max_errors: int | None,
+    ):
+        self.typ = typ
+        self.skip_invalid = skip_invalid
+        self.on_error = on_error
+        self.index = 0
+        self._decode = _compile(typ)
+        self._limit = _limit(fail_fast, max_errors)
+
+    def decode(self, raws: list[Any]) -> Iterator[Any]:
+        for raw in raws:
+            res, exc = _decode_record(
+                raw, self.index, self._decode, self.typ, self._limit
+            )
+            self.index += 1
+
+            if exc is None:
+                yield res
+            elif not self.skip_invalid:
+                raise exc
+            elif self.on_error is not None:
+                self.on_error(exc)
+
+
+class _TextDecoder:
+    """Decode text or utf-8 bytes chunks to text, a character may be split
+    between bytes chunks."""
+
+    def __init__(self) -> None:
+        self._decoder: codecs.IncrementalDecoder | None = None
+
+    def decode(self, chunk: str | bytes) -> str:
+        if isinstance(chunk, str):
+            return chunk
+        if self._decoder is None:
+            self._decoder = codecs.getincrementaldecoder("utf-8")()
+        return self._decoder.decode(chunk)
+
+    def flush(self) -> str:
+        """Return the rest of the text, raise on a truncated character."""
+        if self._decoder is None:
+            return ""
+        return self._decoder.decode(b"", True)
+
+
+def _text_chunks(fp: Any, chunk_size: int) -> Iterator[str]:
+    """Read text from a text or utf-8 binary file-like object in chunks."""
+    text_decoder = _TextDecoder()
+
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        yield text_decoder.decode(chunk)
+
+    yield text_decoder.flush()
+
+
+def iter_json(
+    fp: IO[str] | IO[bytes],
+    typ: Any,
+    *,
+    format: str = "auto",
+    skip_invalid: bool = False,
+    on_error: Callable[[ValidationErrors], None] | None = None,
+    chunk_size: int = 65536,
+    fail_fast: bool = False,
+    max_errors: int | None = None,
+) -> Iterator[Any]:
+    """Decode the records of NDJSON or of a top-level JSON array one at a time.
+
+    fp is read in chunks of chunk_size, text or utf-8 bytes. format "auto"
+    treats input starting with "[" as an array and anything else as NDJSON.
+    An invalid record raises ValidationErrors with the record index as the
+    first key; with skip_invalid it is passed to on_error and skipped.
+    """
+    splitter = _Splitter(format)
+    records = _Records(typ, skip_invalid, on_error, fail_fast, max_errors)
+
+    for chunk in _text_chunks(fp, chunk_size):
+        yield from records.decode(splitter.feed(chunk))
+    yield from records.decode(splitter.close())
+
+
+def iter_json_file(
+    path: str | os.PathLike, typ: Any, **kwargs: Any
+) -> Iterator[Any]:
+    """Like `iter_json`, reading the file through a memory map.
+
+    Only the current chunk of the file is copied out of the page cache, so
+    files larger than memory can be decoded.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter_json(mm, typ, **kwargs)
+
+
+def _from_json_array(chunks: Iterable[str], typ: Any, limit: int) -> Any:
+    """Decode a top-level JSON array into typ `list[T]` one item at a time.
+
+    Errors and the result are the same as decoding the whole parsed array.
+    """
+    (t,) = get_args(typ)
+    decode = _compile(t)
+    splitter = _Splitter("array")
+    res = []
+    errors: list[ValidationError] = []
+    index = 0
+
+    for chunk in itertools.chain(chunks, [None]):
+        raws = splitter.close() if chunk is None else splitter.feed(chunk)
+        for raw in raws:
+            v, err = decode(raw, limit)
+            if err:
+                errors.extend(_prefix(err, index))
+                if len(errors) >= limit:
+                    raise ValidationErrors(typ, errors[:limit])
+            else:
+                res.append(v)
+            index += 1
+
+    if errors:
+        raise ValidationErrors(typ, errors)
+    return res
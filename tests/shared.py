@@ -3,10 +3,19 @@ from python_dejson.errors import ValidationErrors
 from python_dejson.dejson import *
 
 
+def _attrs(e: Any) -> dict[str, Any]:
+    # errors are slotted: collect the slots of the class and its bases
+    return {
+        k: getattr(e, k)
+        for cls in type(e).__mro__
+        for k in getattr(cls, "__slots__", ())
+    }
+
+
 def err_to_dict(err: ValidationErrors) -> dict[str, Any]:
     return dict(
         class_type=err.class_type,
-        errors=[{**vars(e), **{"cls": e.__class__}} for e in err.errors],
+        errors=[{**_attrs(e), **{"cls": e.__class__}} for e in err.errors],
     )
 
 
@@ -0,0 +1,89 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from python_dejson.aio import aiter_json, from_json_async
+from python_dejson.errors import ValidationErrors
+
+
+@dataclass
+class Item:
+    a: int
+
+
+def test_from_json_async():
+    s = json.dumps([{"a": i} for i in range(100)])
+    expected = [Item(a=i) for i in range(100)]
+
+    async def run():
+        assert await from_json_async(s, list[Item]) == expected
+        with ThreadPoolExecutor(1) as executor:
+            res = await from_json_async(s, list[Item], executor=executor, threshold=0)
+            assert res == expected
+        try:
+            await from_json_async('{"a": "1"}', Item, threshold=0)
+            assert False
+        except ValidationErrors as e:
+            assert e.errors[0].keys == ["a"]
+
+    asyncio.run(run())
+
+
+def test_aiter_json():
+    s = "".join(json.dumps({"a": i}) + "\n" for i in range(20)).encode()
+
+    async def chunks():
+        for i in range(0, len(s), 7):
+            yield s[i : i + 7]
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(s)
+        reader.feed_eof()
+        items = [item async for item in aiter_json(reader, Item, chunk_size=5)]
+        assert items == [Item(a=i) for i in range(20)]
+
+        items = [item async for item in aiter_json(chunks(), Item)]
+        assert items == [Item(a=i) for i in range(20)]
+
+        errors = []
+        bad = [b'[{"a": 1}, {"a": "2"}, ', b'{"a": 3}]']
+        it = aiter_json(_aiter(bad), Item, skip_invalid=True, on_error=errors.append)
+        assert [item async for item in it] == [Item(a=1), Item(a=3)]
+        assert [e.errors[0].keys for e in errors] == [[1, "a"]]
+
+    asyncio.run(run())
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+def test_aiter_json_yields_to_loop():
+    # a fully buffered reader never suspends: decoding must still let other
+    # tasks run between chunks
+    s = "".join(json.dumps({"a": i}) + "\n" for i in range(1000)).encode()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(s)
+        reader.feed_eof()
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        start = ticks
+        n = 0
+        async for _ in aiter_json(reader, Item, chunk_size=len(s) // 10):
+            n += 1
+        task.cancel()
+        assert n == 1000
+        assert ticks - start >= 10
+
+    asyncio.run(run())
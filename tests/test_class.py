@@ -1,6 +1,8 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, make_dataclass
 import enum
-from typing import Any
+import gc
+import weakref
+from typing import Any, Optional
 from python_dejson.errors import (
     ValidationErrors,
     ValidationExtraFieldError,
@@ -8,7 +10,14 @@ from python_dejson.errors import (
     ValidationTypeError,
     ValidationTypesError,
 )
-from python_dejson.dejson import cls_types, from_object
+from python_dejson.dejson import (
+    cls_defaults,
+    cls_fields,
+    cls_types,
+    from_object,
+    invalidate,
+)
+from python_dejson.encode import to_object
 from .shared import from_object_err
 
 
@@ -241,3 +250,57 @@ def test_extra_fields():
     assert e.name == k
     assert e.type is type(v)
     assert e.keys == [k]
+
+
+def test_cls_meta_cached():
+    @dataclass
+    class Base:
+        a: int = 1
+
+    @dataclass
+    class Simple(Base):
+        b: str = "1"
+        c: list[int] = field(default_factory=list)
+
+    assert cls_types(Simple) == {"a": int, "b": str, "c": list[int]}
+    # copies: changing them doesn't affect decoding
+    cls_types(Simple)["zzz"] = str
+    cls_defaults(Simple)["a"] = 2
+    assert from_object({}, Simple) == Simple()
+    assert cls_defaults(Simple) == {"a": 1, "b": "1"}
+    assert list(cls_fields(Simple).keys()) == ["a", "b", "c"]
+
+
+def test_invalidate():
+    class Simple:
+        a: int
+
+        def __init__(self, a: int, **data: Any):
+            self.a = a
+            self.__dict__.update(data)
+
+    assert from_object({"a": 1}, Simple).a == 1
+    assert from_object_err({"a": 1, "b": "1"}, Simple) is not None
+
+    Simple.__annotations__["b"] = str
+    invalidate(Simple)
+
+    assert cls_types(Simple) == {"a": int, "b": str}
+    assert from_object({"a": 1, "b": "1"}, Simple).b == "1"
+
+
+def test_dynamic_classes_collected():
+    refs = []
+    for i in range(3):
+        item = make_dataclass(f"Item{i}", [("a", int)], frozen=True)
+        cls = make_dataclass(f"Dyn{i}", [("items", list[item]), ("b", Optional[str])])
+        obj = from_object({"items": [{"a": 1}], "b": None}, cls)
+        assert from_object([{"a": 1}], list[item]) == obj.items
+        assert to_object(obj, cls) == {"items": [{"a": 1}], "b": None}
+        refs += [weakref.ref(cls), weakref.ref(item)]
+        del item, cls, obj
+
+    # the metadata of a class holds its field types until it is collected
+    gc.collect()
+    gc.collect()
+    assert [r() for r in refs] == [None] * len(refs)
@@ -0,0 +1,87 @@
+import enum
+from dataclasses import dataclass, field
+from python_dejson.codegen import source
+from python_dejson.dejson import set_backend
+from .shared import err_to_dict, from_object_err, from_object_val
+
+
+class A(enum.Enum):
+    a = 1
+    b = 2
+    c = [3]
+
+
+@dataclass(frozen=True)
+class D:
+    x: A
+
+
+@dataclass(frozen=True)
+class Base:
+    a: str
+
+
+@dataclass(frozen=True)
+class Complex(Base):
+    b: tuple[int, str]
+    c: dict[str, int]
+    d: list[int]
+    e: A
+    f: D
+    g: int | str
+    h: set[int] = field(default_factory=lambda: {9})
+    i: float = 1.5
+
+
+def _decode_both(val, typ):
+    res = []
+    for backend in ["interpreter", "codegen"]:
+        set_backend(backend)
+        try:
+            err = from_object_err(val, typ)
+            res.append((from_object_val(val, typ), err and err_to_dict(err)))
+        finally:
+            set_backend("interpreter")
+    return res
+
+
+def test_codegen_same_as_interpreter():
+    data = {
+        "a": "1",
+        "b": [1, "s"],
+        "c": {"s": 1},
+        "d": [1, 2, 3],
+        "e": 1,
+        "f": {"x": 2},
+        "g": 1,
+    }
+    vals = [
+        data,
+        {**data, "h": [1], "i": 2.5},
+        {**data, "e": [3]},
+        {},
+        [],
+        {"z": 1, **data, "y": 2},
+        {
+            "a": 1,
+            "b": ["1", "s", 3],
+            "c": {"s": 1},
+            "d": [1, 2, 3],
+            "e": 4,
+            "f": {"x": 4},
+            "g": 8.0,
+            "h": ["9"],
+            "i": "1",
+        },
+    ]
+    for val in vals:
+        interpreted, generated = _decode_both(val, Complex)
+        assert interpreted == generated
+        interpreted, generated = _decode_both([val], list[Complex])
+        assert interpreted == generated
+
+
+def test_source():
+    src = source(Complex)
+    assert src.startswith("def decode_Complex(val, limit):")
+    assert "_cls(a=f0, b=f1, c=f2, d=f3, e=f4, f=f5, g=f6, i=f8, **kw)" in src
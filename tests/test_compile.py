@@ -0,0 +1,101 @@
+import threading
+import time
+from dataclasses import dataclass
+from python_dejson import dejson
+from python_dejson.errors import (
+    ValidationErrors,
+    ValidationExtraFieldError,
+    ValidationTypeError,
+)
+from python_dejson.dejson import Decoder, compile, from_json, from_object, from_objects
+from .shared import from_object_err
+
+
+def test_compile_cached():
+    @dataclass
+    class Simple:
+        a: int
+
+    dec = compile(Simple)
+    assert type(dec) is Decoder
+    assert dec._decode is compile(Simple)._decode
+    assert dec.from_object({"a": 1}) == Simple(a=1)
+    assert dec.from_json('{"a": 1}') == Simple(a=1)
+    assert from_object({"a": 1}, Simple) == Simple(a=1)
+    assert from_json('{"a": 1}', Simple) == Simple(a=1)
+
+    err = from_object_err({"a": "1"}, Simple)
+    assert type(err) is ValidationErrors
+    e = err.errors[0]
+    assert type(e) is ValidationTypeError
+    assert e.keys == ["a"]
+
+
+def test_compile_union_order():
+    @dataclass
+    class A:
+        x: int = 0
+
+    @dataclass
+    class B:
+        x: int = 0
+
+    assert type(from_object({}, A | B)) is A
+    assert type(from_object({}, B | A)) is B
+
+
+def test_compile_unsupported():
+    dec = compile(list[object()])
+    try:
+        dec.from_object([1])
+        assert False
+    except Exception as e:
+        assert "unsupported type" in str(e)
+
+    assert dec.from_object([]) == []
+
+
+def test_from_objects():
+    @dataclass
+    class Simple:
+        a: int
+
+    vals = [{"a": 1}, {"a": "2"}, {"b": 3, "a": "3"}, {"a": 4}]
+    res, err = from_objects(vals, Simple)
+    assert res == [Simple(a=1), None, None, Simple(a=4)]
+    assert [[(type(e), e.keys) for e in errs] for errs in err] == [
+        [],
+        [(ValidationTypeError, ["a"])],
+        [(ValidationExtraFieldError, ["b"]), (ValidationTypeError, ["a"])],
+        [],
+    ]
+
+    res, err = compile(Simple).from_objects(iter(vals), fail_fast=True)
+    assert res == [Simple(a=1), None, None, Simple(a=4)]
+    assert [len(errs) for errs in err] == [0, 1, 1, 0]
+
+
+def test_compile_concurrent(monkeypatch):
+    @dataclass
+    class Cfg:
+        retries: int = 3
+        name: str = "default"
+
+    started = threading.Event()
+    build = dejson._build
+
+    def slow_build(typ):
+        if typ is int:
+            started.set()
+            time.sleep(0.1)
+        return build(typ)
+
+    monkeypatch.setattr(dejson, "_build", slow_build)
+    dejson.invalidate()
+
+    # the second thread looks Cfg up while the first one compiles its fields
+    t = threading.Thread(target=compile, args=(Cfg,))
+    t.start()
+    started.wait()
+    assert from_object({"retries": 9, "name": "x"}, Cfg) == Cfg(9, "x")
+    t.join()
@@ -0,0 +1,80 @@
+import json
+from dataclasses import InitVar, dataclass, field
+from python_dejson.dejson import from_json, from_object, set_backend, set_construction
+
+
+class Plain:
+    a: int
+    b: str = "b"
+
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("__init__ called")
+
+
+@dataclass(frozen=True)
+class Frozen:
+    a: int
+    tags: tuple[str, ...] = field(default_factory=tuple)
+    total: int = field(default=0, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "total", self.a + len(self.tags))
+
+
+@dataclass(slots=True)
+class Slotted:
+    a: int
+    nested: Frozen
+
+
+def test_trusted_construction():
+    set_construction(Plain, "trusted")
+    set_construction(Frozen, "trusted")
+    set_construction(Slotted, "trusted")
+    try:
+        res = from_object({"a": 1}, Plain)
+        assert type(res) is Plain
+        assert vars(res) == {"a": 1, "b": "b"}
+
+        res = from_object({"a": 1, "tags": ["x", "y"]}, Frozen)
+        assert res == Frozen(1, ("x", "y"))
+        assert res.total == 3
+        assert hash(res) == hash(Frozen(1, ("x", "y")))
+        assert from_object({"a": 1}, Frozen).tags == ()
+
+        res = from_object({"a": 1, "nested": {"a": 2}}, Slotted)
+        assert res == Slotted(1, Frozen(2))
+        assert not hasattr(res, "__dict__")
+
+        s = json.dumps({"a": 1, "nested": {"a": 2, "tags": ["x"]}})
+        assert from_json(s, Slotted, single_pass=True) == from_json(s, Slotted)
+        set_backend("codegen")
+        try:
+            assert from_json(s, Slotted) == Slotted(1, Frozen(2, ("x",)))
+        finally:
+            set_backend("interpreter")
+    finally:
+        for cls in [Plain, Frozen, Slotted]:
+            set_construction(cls, "init")
+
+    try:
+        from_object({"a": 1}, Plain)
+        assert False
+    except AssertionError as e:
+        assert str(e) == "__init__ called"
+
+
+def test_trusted_construction_initvar():
+    @dataclass
+    class WithInitVar:
+        a: int
+        scale: InitVar[int] = 1
+
+    set_construction(WithInitVar, "trusted")
+    try:
+        from_object({"a": 1}, WithInitVar)
+        assert False
+    except Exception as e:
+        assert "InitVar" in str(e)
+    finally:
+        set_construction(WithInitVar, "init")
@@ -0,0 +1,104 @@
+import enum
+import json
+from dataclasses import dataclass, field
+from typing import Annotated
+from python_dejson.dejson import Discriminator, from_object
+from python_dejson.encode import to_json, to_object
+
+
+class A(enum.Enum):
+    a = 1
+    b = 2
+
+
+@dataclass(frozen=True)
+class D:
+    x: A
+
+
+@dataclass(frozen=True)
+class Complex:
+    a: str
+    b: tuple[int, str]
+    c: dict[str, int]
+    d: list[int]
+    e: A
+    f: D
+    g: int | str | D
+    h: set[int] = field(default_factory=set)
+    i: tuple[D, ...] = ()
+    j: dict[A, list[D]] = field(default_factory=dict)
+
+
+def test_to_object():
+    data = {
+        "a": "1",
+        "b": [1, "s"],
+        "c": {"s": 1},
+        "d": [1, 2, 3],
+        "e": 1,
+        "f": {"x": 2},
+        "g": {"x": 1},
+        "h": [9],
+        "i": [{"x": 1}, {"x": 2}],
+        "j": {},
+    }
+    obj = from_object(data, Complex)
+    assert to_object(obj, Complex) == data
+    assert json.loads(to_json(obj, Complex)) == data
+
+    obj = from_object({**data, "g": "s"}, Complex)
+    assert to_object(obj, Complex)["g"] == "s"
+
+    assert to_object([A.a, A.b], list[A]) == [1, 2]
+    assert to_object({A.a: [D(x=A.b)]}, dict[A, list[D]]) == {1: [{"x": 2}]}
+    assert to_object({1, 2}, set[int]) in ([1, 2], [2, 1])
+    assert to_object(1, int) == 1
+
+
+def test_to_object_container_union():
+    typ = list[int] | list[A]
+    assert to_json([A.a, A.b], typ) == "[1, 2]"
+    assert to_object([1, 2], typ) == [1, 2]
+    assert to_object([], typ) == []
+
+    typ = dict[str, int] | dict[str, D]
+    assert to_object({"k": D(x=A.a)}, typ) == {"k": {"x": 1}}
+    assert to_object({"k": 1}, typ) == {"k": 1}
+
+
+@dataclass
+class Base:
+    x: int
+
+
+@dataclass
+class Sub(Base):
+    y: int
+
+
+def test_to_object_subclass_union():
+    # the most specific arm wins, whatever the order of the arms
+    for typ in [Base | Sub, Sub | Base]:
+        assert to_object(Sub(1, 2), typ) == {"x": 1, "y": 2}
+        assert to_object(Base(1), typ) == {"x": 1}
+        assert to_object([Base(1), Sub(1, 2)], list[typ]) == [
+            {"x": 1},
+            {"x": 1, "y": 2},
+        ]
+
+
+def test_to_object_tagged_union():
+    @dataclass
+    class Cat:
+        lives: int
+        kind: str = "cat"
+
+    @dataclass
+    class Dog:
+        name: str
+        kind: str = "dog"
+
+    typ = list[Annotated[Cat | Dog, Discriminator("kind")]]
+    data = [{"lives": 9, "kind": "cat"}, {"name": "a", "kind": "dog"}]
+    assert to_object(from_object(data, typ), typ) == data
@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from python_dejson import errors
+from python_dejson.errors import (
+    TruncatedValue,
+    ValidationErrors,
+    ValidationExtraFieldError,
+    ValidationTypeError,
+    set_value_retention,
+)
+from .shared import from_object_err
+
+
+@dataclass
+class Simple:
+    a: int
+    b: list[int]
+
+
+def test_errors_slotted():
+    err = from_object_err({"a": "1", "x": 1, "y": 2}, Simple)
+    assert isinstance(err, ValidationErrors)
+    for e in err.errors:
+        assert not hasattr(e, "__dict__")
+
+    e1, e2 = err.errors[:2]
+    assert type(e1) is ValidationExtraFieldError
+    # one tuple of field names per class
+    assert e1.expected_names == ("a", "b")
+    assert e1.expected_names is e2.expected_names
+    assert str(e1) == (
+        "expected: fields=['a', 'b']; got: field=x val=1 type=<class 'int'>"
+    )
+
+
+def test_value_retention():
+    val = {"a": {"big": list(range(1000))}, "b": ["s" * 100], "x": 1.5}
+    full = str(from_object_err(val, Simple))
+
+    set_value_retention(20)
+    try:
+        err = from_object_err(val, Simple)
+    finally:
+        set_value_retention(None)
+
+    extra, a, b = err.errors
+    assert extra.value == 1.5
+    assert type(a) is ValidationTypeError
+    assert type(a.value) is TruncatedValue
+    assert a.type is dict
+    assert len(a.value) <= 23 and a.value.startswith("{'big': [0, 1, 2")
+    assert b.value == "s" * 20 + "..."
+    assert b.keys == ["b", 0]
+    assert len(str(err)) < len(full)
+
+    assert errors._max_value_len is None
+    assert str(from_object_err(val, Simple)) == full
@@ -0,0 +1,130 @@
+import json
+from dataclasses import dataclass
+from typing import Optional
+from python_dejson.dejson import (
+    disable_interning,
+    enable_interning,
+    from_json,
+    from_object,
+    interning_stats,
+)
+
+
+@dataclass(frozen=True)
+class Address:
+    city: str
+    zip: str
+
+
+@dataclass(frozen=True)
+class Person:
+    name: str
+    address: Address
+    tags: list[str]
+    props: dict[str, str]
+
+
+def _payload(n):
+    return [
+        {
+            "name": f"p{i}",
+            "address": {"city": "Paris", "zip": "75001"},
+            "tags": ["status-" + "active"],
+            "props": {"country-" + "code": "FR"},
+        }
+        for i in range(n)
+    ]
+
+
+def test_interning():
+    payload = _payload(3)
+    expected = from_object(payload, list[Person])
+    assert expected[0].address is not expected[1].address
+
+    for max_strings in [None, 100]:
+        enable_interning(max_strings=max_strings, max_instances=100)
+        try:
+            res = from_object(payload, list[Person])
+            assert res == expected
+            assert res[0].address is res[1].address is res[2].address
+            assert res[0].tags[0] is res[1].tags[0]
+            k0, k1 = (next(iter(p.props)) for p in res[:2])
+            assert k0 is k1
+
+            s = json.dumps(payload)
+            res = from_json(s, list[Person], single_pass=True)
+            assert res[0].address is res[2].address
+
+            stats = interning_stats()
+            assert stats["instances"]["hits"] >= 4
+            assert (stats["strings"] is None) == (max_strings is None)
+        finally:
+            disable_interning()
+
+    assert interning_stats() == {"strings": None, "instances": None}
+    res = from_object(payload, list[Person])
+    assert res[0].address is not res[1].address
+
+
+def test_interning_eviction():
+    enable_interning(max_strings=2, max_instances=1)
+    try:
+        res = from_object(
+            [{"city": c, "zip": "z"} for c in "abab"], list[Address]
+        )
+        assert res[0] == res[2] and res[0] is not res[2]
+        stats = interning_stats()
+        assert stats["instances"]["size"] == 1
+        assert stats["instances"]["evictions"] == 3
+        assert stats["strings"]["size"] == 2
+    finally:
+        disable_interning()
+
+
+@dataclass(frozen=True)
+class Point:
+    x: int
+    y: int = 3
+    tags: tuple[int, ...] = ()
+
+
+def test_interning_keeps_field_types():
+    enable_interning(max_instances=100)
+    try:
+        for typ in [list[Point], list[Point | None]]:
+            payload = [{"x": 1, "y": 1, "tags": [1]}, {"x": 1, "y": True}]
+            payload += [{"x": 1, "y": 1, "tags": [True]}, {"x": True, "y": 1}]
+            res = from_object(payload, typ)
+            assert [type(p.y) for p in res] == [int, bool, int, int]
+            assert [type(p.x) for p in res] == [int, int, int, bool]
+            assert type(res[2].tags[0]) is bool
+
+            res = from_json(json.dumps(payload), typ, single_pass=True)
+            assert [type(p.y) for p in res] == [int, bool, int, int]
+            assert type(res[2].tags[0]) is bool
+    finally:
+        disable_interning()
+
+
+@dataclass(frozen=True)
+class Node:
+    v: int
+    next: Optional["Node"] = None
+
+
+# annotations are not resolved: refer to the class itself
+Node.__annotations__["next"] = Optional[Node]
+
+
+def test_interning_self_reference():
+    payload = [{"v": 1, "next": {"v": 2}}] * 2
+    enable_interning(max_instances=100)
+    try:
+        res = from_object(payload, list[Node])
+        assert res[0] is res[1]
+        assert res[0].next is from_object({"v": 2}, Node)
+
+        res = from_json(json.dumps(payload), list[Node], single_pass=True)
+        assert res[0] is res[1]
+    finally:
+        disable_interning()
@@ -0,0 +1,110 @@
+import copy
+import pickle
+from dataclasses import dataclass, field
+from enum import Enum
+from python_dejson.errors import (
+    ValidationErrors,
+    ValidationExtraFieldError,
+    ValidationFieldRequiredError,
+    ValidationTypeError,
+    ValidationTypesError,
+)
+from python_dejson.dejson import from_object
+from python_dejson.lazy import Lazy, from_json_lazy, from_object_lazy
+
+
+class Color(Enum):
+    red = "red"
+
+
+@dataclass
+class Inner:
+    x: int
+    ys: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Outer:
+    name: str
+    color: Color
+    inner: Inner
+    items: dict[str, Inner]
+    tags: list[str] = field(default_factory=lambda: ["t"])
+
+
+def _errors(fn):
+    try:
+        fn()
+        assert False
+    except ValidationErrors as e:
+        assert e.class_type is Outer
+        return [(type(err), err.keys) for err in e.errors]
+
+
+def test_lazy():
+    val = {
+        "name": "n",
+        "color": "red",
+        "inner": {"x": 1, "ys": [1, 2]},
+        "items": {"k": {"x": 2}},
+    }
+    res = from_object_lazy(val, Outer)
+    assert isinstance(res, Lazy)
+    assert res.name == "n"
+    assert res.color is Color.red
+    assert isinstance(res.inner, Lazy)
+    assert res.inner is res.inner
+    assert res.inner.ys == [1, 2]
+    assert res.items == {"k": Inner(2)}
+    assert res.tags == ["t"]
+    assert res.materialize() == from_object(val, Outer)
+    assert from_json_lazy('{"x": 1}', Inner).materialize() == Inner(1)
+
+    try:
+        res.missing
+        assert False
+    except AttributeError:
+        pass
+
+
+def test_lazy_errors():
+    # scalars, extra and required fields are checked at once
+    assert _errors(
+        lambda: from_object_lazy({"name": 1, "color": "red", "z": 1}, Outer)
+    ) == [
+        (ValidationExtraFieldError, ["z"]),
+        (ValidationTypeError, ["name"]),
+        (ValidationFieldRequiredError, ["inner"]),
+        (ValidationFieldRequiredError, ["items"]),
+    ]
+
+    # nested values only on access or materialize
+    val = {
+        "name": "n",
+        "color": "red",
+        "inner": {"x": "1", "ys": [1, None]},
+        "items": {"k": {"x": 1, "ys": None}},
+    }
+    res = from_object_lazy(val, Outer)
+    assert res.name == "n"
+    assert _errors(lambda: res.inner) == [(ValidationTypeError, ["inner", "x"])]
+    assert _errors(lambda: res.items) == [
+        (ValidationTypesError, ["items", "k", "ys"])
+    ]
+    assert _errors(res.materialize) == [
+        (ValidationTypeError, ["inner", "x"]),
+        (ValidationTypeError, ["inner", "ys", 1]),
+        (ValidationTypesError, ["items", "k", "ys"]),
+    ]
+
+    res = from_object_lazy(val, Outer, fail_fast=True)
+    assert len(_errors(res.materialize)) == 1
+
+
+def test_lazy_copy():
+    val = {"name": "n", "color": "red", "inner": {"x": 1}, "items": {}}
+    proxy = from_object_lazy(val, Outer)
+    for res in [copy.copy(proxy), pickle.loads(pickle.dumps(proxy))]:
+        assert res.name == "n"
+        assert res.inner.x == 1
+        assert res.materialize() == proxy.materialize()
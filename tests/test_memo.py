@@ -0,0 +1,120 @@
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+from python_dejson.dejson import (
+    from_object,
+    invalidate,
+    memo_stats,
+    memoize,
+    unmemoize,
+)
+from .shared import from_object_err
+
+
+class Kind(Enum):
+    a = "a"
+
+
+@dataclass(frozen=True)
+class Product:
+    sku: str
+    kind: Kind
+    price: float
+    sizes: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    product: Product
+
+
+def test_memoize():
+    product = {"sku": "s", "kind": "a", "price": 1.5, "sizes": [1, 2]}
+    payload = [{"id": i, "product": dict(product)} for i in range(4)]
+
+    memoize(Product, max_entries=2)
+    try:
+        res = from_object(payload, list[Event])
+        assert res == [Event(i, Product("s", Kind.a, 1.5, (1, 2))) for i in range(4)]
+        assert res[0].product is res[3].product
+        assert memo_stats()["Product"] == {
+            "entries": 1,
+            "bytes": len(json.dumps(product, separators=(",", ":"))),
+            "hits": 3,
+            "misses": 1,
+        }
+
+        # invalid payloads are not cached, equal payloads only
+        bad = {**product, "price": 1}
+        assert from_object_err(bad, Product) is not None
+        assert from_object_err(bad, Product) is not None
+        assert from_object({**product, "price": 2.0}, Product).price == 2.0
+        assert from_object({**product, "sku": "t"}, Product).sku == "t"
+        assert memo_stats()["Product"]["entries"] == 2
+
+        # the key order doesn't matter
+        reordered = dict(reversed(product.items()))
+        assert from_object(reordered, Product) is from_object(product, Product)
+
+        invalidate()
+        assert memo_stats()["Product"]["entries"] == 0
+        assert from_object(product, Product) is not res[0].product
+    finally:
+        unmemoize(Product)
+
+    assert memo_stats() == {}
+    res = from_object(payload, list[Event])
+    assert res[0].product is not res[1].product
+
+
+def test_memoize_bytes():
+    memoize(Product, max_bytes=100)
+    try:
+        for i in range(5):
+            from_object(
+                {"sku": str(i), "kind": "a", "price": 1.0, "sizes": []}, Product
+            )
+        stats = memo_stats()["Product"]
+        assert stats["bytes"] <= 100
+        assert stats["entries"] < 5
+    finally:
+        unmemoize(Product)
+
+
+def test_memoize_mutable():
+    @dataclass
+    class Mutable:
+        a: int
+
+    @dataclass(frozen=True)
+    class WithList:
+        a: list[int]
+
+    for cls in [Mutable, WithList]:
+        try:
+            memoize(cls)
+            assert False
+        except Exception as e:
+            assert "immutable" in str(e)
+
+
+@dataclass(frozen=True)
+class Node:
+    v: int
+    next: Optional["Node"] = None
+
+
+# annotations are not resolved: refer to the class itself
+Node.__annotations__["next"] = Optional[Node]
+
+
+def test_memoize_self_reference():
+    memoize(Node)
+    try:
+        res = from_object([{"v": 1, "next": {"v": 2}}, {"v": 2}], list[Node])
+        assert res[0].next is res[1]
+        assert memo_stats()["Node"]["hits"] == 1
+    finally:
+        unmemoize(Node)
@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from python_dejson.errors import ValidationErrors, ValidationTypeError
+from python_dejson.dejson import (
+    disable_interning,
+    enable_interning,
+    from_objects,
+    set_construction,
+)
+from python_dejson.parallel import from_object_parallel, from_objects_parallel
+
+
+@dataclass
+class Item:
+    a: int
+
+
+def test_from_object_parallel():
+    vals = [{"a": i} for i in range(20)]
+    opts = dict(chunk_size=3, min_parallel=0)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        res = from_object_parallel(vals, list[Item], executor=executor, **opts)
+        assert res == [Item(a=i) for i in range(20)]
+
+        vals[4] = {"a": "4"}
+        vals[17] = {"a": "17"}
+        try:
+            from_object_parallel(vals, list[Item], executor=executor, **opts)
+            assert False
+        except ValidationErrors as e:
+            assert [(type(e), e.keys) for e in e.errors] == [
+                (ValidationTypeError, [4, "a"]),
+                (ValidationTypeError, [17, "a"]),
+            ]
+
+        try:
+            from_object_parallel(
+                vals, list[Item], executor=executor, fail_fast=True, **opts
+            )
+            assert False
+        except ValidationErrors as e:
+            assert [e.keys for e in e.errors] == [[4, "a"]]
+
+        res, err = from_objects_parallel(vals, Item, executor=executor, **opts)
+        expected_res, expected_err = from_objects(vals, Item)
+        assert res == expected_res
+        assert [[e.keys for e in errs] for errs in err] == [
+            [e.keys for e in errs] for errs in expected_err
+        ]
+
+    assert from_object_parallel(vals[:3], list[Item]) == [Item(a=i) for i in range(3)]
+
+
+@dataclass(frozen=True)
+class Shared:
+    a: int
+
+
+@dataclass
+class Trusted:
+    a: int
+
+    def __init__(self, a):
+        raise Exception("called __init__")
+
+
+def test_parallel_settings():
+    vals = [{"a": 1} for _ in range(6)]
+    opts = dict(chunk_size=3, min_parallel=0)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        res = from_object_parallel(vals, list[Shared], executor=executor, **opts)
+        assert res[0] is not res[1]
+
+        enable_interning()
+        try:
+            res = from_object_parallel(vals, list[Shared], executor=executor, **opts)
+            # shared within a chunk, pickled back as one
+            assert res[0] is res[1] is res[2]
+        finally:
+            disable_interning()
+        res = from_object_parallel(vals, list[Shared], executor=executor, **opts)
+        assert res[0] is not res[1]
+
+        set_construction(Trusted, "trusted")
+        try:
+            res = from_object_parallel(vals, list[Trusted], executor=executor, **opts)
+            assert [t.a for t in res] == [1] * 6
+        finally:
+            set_construction(Trusted, "init")
@@ -0,0 +1,83 @@
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+from python_dejson.errors import ValidationErrors
+from python_dejson.dejson import from_json
+from .shared import err_to_dict
+
+
+@dataclass
+class Leaf:
+    a: int
+    b: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Child:
+    name: str
+    leaves: list[Leaf]
+
+
+@dataclass
+class Node:
+    name: str
+    leaves: list[Leaf]
+    by_key: dict[str, Leaf]
+    child: Optional[Child] = None
+
+
+def _decode(s, typ, **kwargs):
+    try:
+        return from_json(s, typ, **kwargs), None
+    except ValidationErrors as e:
+        return None, err_to_dict(e)
+
+
+def _same(s, typ, **kwargs):
+    expected = _decode(s, typ, **kwargs)
+    assert _decode(s, typ, single_pass=True, **kwargs) == expected
+    return expected
+
+
+def test_single_pass():
+    node = {
+        "name": "n",
+        "leaves": [{"a": 1}, {"a": 2, "b": ["x"]}],
+        "by_key": {"k": {"b": [], "a": 3}},
+        "child": {"name": "c", "leaves": [{"a": 4}]},
+    }
+    res, err = _same(json.dumps(node, indent=2), Node)
+    assert err is None
+    assert res.leaves == [Leaf(1), Leaf(2, ["x"])]
+    assert res.child == Child("c", [Leaf(4)])
+
+    assert _same(json.dumps([node, node]).encode(), list[Node])[1] is None
+    assert _same(' [ ] ', list[Leaf]) == ([], None)
+    assert _same('{"k": [1, 2]}', dict[str, list[int]]) == ({"k": [1, 2]}, None)
+
+
+def test_single_pass_errors():
+    for payload, typ in [
+        ({"a": "1", "x": 1, "y": 2, "b": [1, "s", 2]}, Leaf),
+        ([{"a": 1}, {}, {"a": None, "b": None}, 1, None], list[Leaf]),
+        ({"1": {"a": "x"}, "y": {"a": 2}}, dict[int, Leaf]),
+        ({"name": 1, "leaves": {}, "by_key": [], "child": {"name": 2}}, Node),
+        ([1, 2], Leaf),
+        ({"a": 1}, list[Leaf]),
+        # repeated keys fall back to the two-pass decode
+        ('{"a": 1, "x": 1, "a": "2", "x": 2}', Leaf),
+        ('{"k": {"a": 1}, "k": {"a": "2"}}', dict[str, Leaf]),
+    ]:
+        s = payload if isinstance(payload, str) else json.dumps(payload)
+        assert _same(s, typ)[1] is not None
+        assert _same(s, typ, fail_fast=True)[1] is not None
+        assert _same(s, typ, max_errors=2)[1] is not None
+
+
+def test_single_pass_invalid_json():
+    for s in ['[{"a": 1}', '{"a" 1}', '{"a": 1 "b": []}', "{a: 1}", "[{}] 1", ""]:
+        try:
+            from_json(s, list[Leaf], single_pass=True)
+            assert False
+        except json.JSONDecodeError:
+            pass
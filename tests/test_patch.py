@@ -0,0 +1,147 @@
+import enum
+from dataclasses import dataclass, field
+from typing import Optional
+from python_dejson.errors import ValidationErrors
+from python_dejson.patch import apply_patch
+from .shared import err_to_dict
+
+
+class A(enum.Enum):
+    x = "x"
+    y = "y"
+
+
+@dataclass(frozen=True)
+class Item:
+    name: str
+    tags: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Order:
+    id: int
+    items: list[Item]
+    meta: dict[str, int]
+    note: Optional[str] = None
+    extra: list[int] = field(default_factory=list)
+
+
+def _order():
+    return Order(1, [Item("a"), Item("b", ("x",))], {"k": 1}, "n")
+
+
+def _errors(obj, typ, patch, **kwargs):
+    try:
+        apply_patch(obj, typ, patch, **kwargs)
+        assert False
+    except ValidationErrors as e:
+        return err_to_dict(e)["errors"]
+
+
+def test_json_patch():
+    order = _order()
+    res = apply_patch(
+        order,
+        Order,
+        [
+            {"op": "replace", "path": "/items/1/name", "value": "c"},
+            {"op": "add", "path": "/items/-", "value": {"name": "d"}},
+            {"op": "add", "path": "/meta/a~1b", "value": 2},
+            {"op": "remove", "path": "/note"},
+            {"op": "copy", "from": "/items/1/tags", "path": "/items/0/tags"},
+            {"op": "test", "path": "/items/0/tags", "value": ["x"]},
+        ],
+    )
+    assert res == Order(
+        1,
+        [Item("a", ("x",)), Item("c", ("x",)), Item("d")],
+        {"k": 1, "a/b": 2},
+    )
+    # copy-on-write: the original is untouched, untouched subtrees are shared
+    assert order == _order()
+    assert res.items[1].tags is order.items[1].tags
+
+    res = apply_patch(order, Order, [{"op": "replace", "path": "/meta/k", "value": 5}])
+    assert res.items is order.items
+    res = apply_patch(
+        order, Order, [{"op": "move", "from": "/items/0", "path": "/items/1"}]
+    )
+    assert res.items == [Item("b", ("x",)), Item("a")]
+    assert res.items[0] is order.items[1]
+
+
+def test_json_patch_errors():
+    order = _order()
+    errors = _errors(
+        order, Order, [{"op": "replace", "path": "/items/1/name", "value": 1}]
+    )
+    assert [e["keys"] for e in errors] == [["items", 1, "name"]]
+
+    errors = _errors(order, Order, [{"op": "add", "path": "/items/0", "value": {}}])
+    assert [e["keys"] for e in errors] == [["items", 0, "name"]]
+
+    for patch, keys in [
+        ([{"op": "remove", "path": "/items/5"}], ["items", 5]),
+        ([{"op": "remove", "path": "/meta/x"}], ["meta", "x"]),
+        ([{"op": "test", "path": "/id", "value": 2}], ["id"]),
+        ([{"op": "add", "path": "/id/x", "value": 2}], ["id"]),
+        ([{"op": "add", "path": "/nope", "value": 2}], ["nope"]),
+        ([{"op": "remove", "path": "/id"}], ["id"]),
+        ([{"op": "move", "from": "/items", "path": "/items/0"}], []),
+        ([{"op": "bad", "path": ""}], []),
+    ]:
+        errors = _errors(order, Order, patch)
+        assert [e["keys"] for e in errors] == [keys]
+
+    # stops at the first failing op
+    patch = [
+        {"op": "replace", "path": "/id", "value": "x"},
+        {"op": "replace", "path": "/note", "value": 1},
+    ]
+    assert len(_errors(order, Order, patch)) == 1
+
+
+def test_patch_union():
+    typ = dict[str, list[int] | list[A]]
+    assert apply_patch({"a": [A.x]}, typ, {"a": ["y"]}) == {"a": [A.y]}
+    patch = [{"op": "add", "path": "/a/-", "value": "y"}]
+    assert apply_patch({"a": [A.x]}, typ, patch) == {"a": [A.x, A.y]}
+
+
+def test_merge_patch():
+    order = _order()
+    res = apply_patch(
+        order,
+        Order,
+        {"note": None, "meta": {"k": None, "j": 2}, "extra": [1]},
+    )
+    assert res == Order(1, order.items, {"j": 2}, None, [1])
+    assert res.items is order.items
+
+    # removing an absent key is a no-op
+    res = apply_patch(order, Order, {"meta": {"zz": None}, "note": "m"})
+    assert res == Order(1, order.items, {"k": 1}, "m")
+
+    errors = _errors(order, Order, {"id": None, "meta": {"j": "x"}, "nope": 1})
+    assert [e["keys"] for e in errors] == [["id"], ["meta", "j"], ["nope"]]
+    assert len(_errors(order, Order, {"id": None, "nope": 1}, fail_fast=True)) == 1
+
+
+@dataclass(frozen=True)
+class Child:
+    name: str
+    opt: int = 5
+
+
+@dataclass(frozen=True)
+class Parent:
+    child: Optional[Child] = None
+    children: dict[str, Child] = field(default_factory=dict)
+
+
+def test_merge_patch_into_absent():
+    # a patch for no object is merged into {}: its nulls are dropped
+    patch = {"child": {"name": "x", "opt": None}}
+    assert apply_patch(Parent(), Parent, patch) == Parent(Child("x"))
+    patch = {"children": {"a": {"name": "x", "opt": None}}}
+    assert apply_patch(Parent(), Parent, patch) == Parent(children={"a": Child("x")})
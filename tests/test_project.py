@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Optional
+from python_dejson.errors import (
+    ValidationErrors,
+    ValidationFieldRequiredError,
+    ValidationTypeError,
+)
+from python_dejson.dejson import UNSET, compile, from_json, from_object, project
+
+
+@dataclass(frozen=True)
+class User:
+    id: int
+    email: str
+    name: str = "anon"
+
+
+@dataclass(frozen=True)
+class Item:
+    sku: str
+    price: float
+
+
+@dataclass(frozen=True)
+class Order:
+    user: User
+    items: list[Item]
+    by_sku: dict[str, Item]
+    note: Optional[User] = None
+
+
+MASK = {"user": {"id", "email"}, "items": {"sku"}}
+
+
+def test_project():
+    val = {
+        "user": {"id": 1, "email": "e", "name": 1},
+        "items": [{"sku": "a", "price": "bad"}, {"sku": "b"}],
+        "by_sku": None,
+    }
+    res = from_object(val, Order, mask=MASK)
+    assert res == Order(
+        User(1, "e", UNSET), [Item("a", UNSET), Item("b", UNSET)], UNSET, UNSET
+    )
+    assert repr(UNSET) == "UNSET"
+
+    decoder = compile(project(Order, MASK))
+    assert decoder.from_object(val) == res
+    assert from_json('{"id": 1, "email": 1}', User, mask=["id"]) == User(
+        1, UNSET, UNSET
+    )
+
+    # a field mapped to True is decoded whole
+    res = from_object(
+        {"user": {"id": 1, "email": "e"}, "note": {"id": 2, "email": "f"}},
+        Order,
+        mask={"user": True, "note": {"email"}},
+    )
+    assert res.user == User(1, "e")
+    assert res.note == User(UNSET, "f", UNSET)
+
+
+def test_project_errors():
+    try:
+        from_object({"user": {"email": 1}, "items": [{}]}, Order, mask=MASK)
+        assert False
+    except ValidationErrors as e:
+        assert e.class_type is Order
+        assert [(type(err), err.keys) for err in e.errors] == [
+            (ValidationFieldRequiredError, ["user", "id"]),
+            (ValidationTypeError, ["user", "email"]),
+            (ValidationFieldRequiredError, ["items", 0, "sku"]),
+        ]
+
+    try:
+        compile(project(Order, {"user": {"x"}}))
+        assert False
+    except Exception as e:
+        assert "unknown fields" in str(e)
@@ -0,0 +1,100 @@
+from dataclasses import dataclass, field
+from typing import Annotated
+from python_dejson.dejson import (
+    Discriminator,
+    cls_defaults,
+    from_object,
+    set_construction,
+    slotted,
+)
+
+
+@dataclass(slots=True)
+class SlotsData:
+    a: int
+    b: int = 2
+    c: list[int] = field(default_factory=list)
+
+
+class HandSlots:
+    __slots__ = ("a", "b")
+    a: int
+    b: str
+
+    def __init__(self, a: int, b: str):
+        self.a = a
+        self.b = b
+
+
+class HandSlotsChild(HandSlots):
+    __slots__ = ()
+
+
+@dataclass(frozen=True)
+class Base:
+    a: int
+
+    def total(self) -> int:
+        return self.a + self.b
+
+
+@dataclass(frozen=True)
+class Child(Base):
+    b: int = 3
+    c: list[int] = field(default_factory=list)
+
+
+def test_slots_dataclass():
+    assert cls_defaults(SlotsData) == {}
+    assert from_object({"a": 1}, SlotsData) == SlotsData(1, 2, [])
+
+    set_construction(SlotsData, "trusted")
+    try:
+        assert from_object({"a": 1}, SlotsData) == SlotsData(1, 2, [])
+    finally:
+        set_construction(SlotsData, "init")
+
+
+def test_hand_written_slots():
+    assert cls_defaults(HandSlots) == {}
+    res = from_object({"a": 1, "b": "x"}, HandSlotsChild)
+    assert type(res) is HandSlotsChild
+    assert (res.a, res.b) == (1, "x")
+
+
+def test_slotted_twin():
+    twin = slotted(Child)
+    assert twin is not Child
+    assert twin.__qualname__ == Child.__qualname__
+
+    res = from_object({"a": 1, "c": [1]}, twin)
+    assert type(res) is twin
+    assert not hasattr(res, "__dict__")
+    assert (res.a, res.b, res.c) == (1, 3, [1])
+    assert res.total() == 4
+    assert res == twin(1, 3, [1])
+
+    class Plain:
+        a: int = 1
+
+    try:
+        slotted(Plain)
+        assert False
+    except Exception as e:
+        assert "field defaults" in str(e)
+
+
+def test_slotted_tagged_union():
+    @dataclass(slots=True)
+    class Cat:
+        lives: int
+        kind: str = "cat"
+
+    @dataclass(slots=True)
+    class Dog:
+        name: str
+        kind: str = "dog"
+
+    typ = Annotated[Cat | Dog, Discriminator("kind")]
+    assert from_object({"kind": "cat", "lives": 9}, typ) == Cat(lives=9)
+    assert from_object({"kind": "dog", "name": "a"}, typ) == Dog(name="a")
@@ -0,0 +1,125 @@
+import json
+from dataclasses import dataclass
+from typing import Optional
+from python_dejson.dejson import (
+    _compile,
+    disable_stats,
+    enable_stats,
+    from_json,
+    reset_stats,
+    stats,
+)
+from python_dejson.lazy import from_json_lazy
+from .shared import from_object_val
+
+
+@dataclass
+class Cat:
+    lives: int
+
+
+@dataclass
+class Dog:
+    name: str
+
+
+@dataclass
+class Home:
+    pets: list[Cat | Dog]
+
+
+def test_stats():
+    calls = []
+    enable_stats(lambda typ, seconds, err: calls.append((typ, bool(err))))
+    try:
+        reset_stats()
+        val = {"pets": [{"lives": 1}, {"name": "a"}, {"name": 1}]}
+        assert from_object_val(val, Home) is None
+
+        s = stats()
+        assert s["types"][repr(Home)]["calls"] == 1
+        assert s["types"][repr(Home)]["errors"] == 1
+        assert s["types"][repr(Dog)]["calls"] == 2
+        assert s["types"][repr(Dog)]["errors"] == 1
+        assert s["fields"]["Home.pets"]["calls"] == 1
+        assert s["fields"]["Dog.name"] == {
+            "calls": 2,
+            "errors": 1,
+            "time": s["fields"]["Dog.name"]["time"],
+        }
+        union = s["unions"][f"{Cat!r} | {Dog!r}"]
+        assert union["calls"] == 3
+        assert union["arms"] == {repr(Cat): 1, repr(Dog): 1}
+        assert union["misses"] == 1
+        assert (Home, True) in calls
+
+        reset_stats()
+        assert stats()["types"][repr(Home)]["calls"] == 0
+    finally:
+        disable_stats()
+
+    # rebuilt without instrumentation
+    decode = _compile(Home)
+    assert decode.__qualname__ != "_timed.<locals>.timed"
+    assert from_object_val({"pets": []}, Home) == Home(pets=[])
+
+
+def test_stats_all_paths():
+    s = json.dumps({"pets": [{"lives": 1}]})
+    # warm the single-pass and lazy caches before stats are enabled
+    from_json(s, Home, single_pass=True)
+    from_json_lazy(s, Home).pets
+
+    enable_stats()
+    try:
+        reset_stats()
+        from_json(s, Home, single_pass=True)
+        from_json_lazy(s, Home).pets
+        assert stats()["types"][repr(list[Cat | Dog])]["calls"] == 2
+    finally:
+        disable_stats()
+
+    reset_stats()
+    from_json(s, Home, single_pass=True)
+    from_json_lazy(s, Home).pets
+    assert stats()["types"][repr(list[Cat | Dog])]["calls"] == 0
+
+
+@dataclass
+class Node:
+    v: int
+    next: Optional["Node"] = None
+
+
+# annotations are not resolved: refer to the class itself
+Node.__annotations__["next"] = Optional[Node]
+
+
+def _point():
+    @dataclass
+    class Point:
+        x: int
+
+    return Point
+
+
+def test_stats_self_reference_and_names():
+    points = [_point(), _point()]
+    enable_stats()
+    try:
+        reset_stats()
+        from_object_val({"v": 1, "next": {"v": 2, "next": {"v": 3}}}, Node)
+        for i, cls in enumerate(points):
+            for _ in range(i + 1):
+                from_object_val({"x": 1}, cls)
+
+        s = stats()
+        assert s["types"][repr(Node)]["calls"] == 3
+        assert s["fields"]["Node.next"]["calls"] == 2
+        # classes of the same name are counted apart
+        field = points[0].__qualname__ + ".x"
+        for kind, name in [("types", repr(points[0])), ("fields", field)]:
+            assert s[kind][name]["calls"] == 1
+            assert s[kind][name + " #2"]["calls"] == 2
+    finally:
+        disable_stats()
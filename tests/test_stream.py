@@ -0,0 +1,159 @@
+import io
+import json
+from dataclasses import dataclass
+from python_dejson.errors import (
+    ValidationErrors,
+    ValidationJSONError,
+    ValidationTypeError,
+)
+from python_dejson.dejson import from_json, from_json_file
+from python_dejson.stream import _Splitter, iter_json, iter_json_file
+
+
+@dataclass
+class Item:
+    a: int
+    b: list[str]
+
+
+def test_iter_json_array():
+    items = [{"a": i, "b": ["x" * i]} for i in range(50)]
+    s = json.dumps(items, indent=2)
+    expected = [Item(a=i, b=["x" * i]) for i in range(50)]
+
+    for chunk_size in [1, 3, 7, 1 << 16]:
+        assert list(iter_json(io.StringIO(s), Item, chunk_size=chunk_size)) == expected
+        fp = io.BytesIO(s.encode())
+        assert list(iter_json(fp, Item, chunk_size=chunk_size)) == expected
+
+    assert list(iter_json(io.StringIO(" [ ] "), Item)) == []
+    assert list(iter_json(io.StringIO("[1, 23, 456]"), int, chunk_size=2)) == [
+        1,
+        23,
+        456,
+    ]
+
+
+def test_iter_json_array_scalars():
+    # numbers and literals split at every possible chunk boundary
+    s = '[1.5, 2.25,1e5 ,-3, 4E-2, 0.5e+1, true, false, null, "x", 10]'
+    expected = json.loads(s)
+    typ = float | int | bool | str | None
+    for chunk_size in range(1, len(s) + 1):
+        res = list(iter_json(io.StringIO(s), typ, chunk_size=chunk_size))
+        assert res == expected
+        assert [type(v) for v in res] == [type(v) for v in expected]
+
+
+def test_iter_json_array_malformed_item():
+    # a malformed item is raised once max_pending of it is buffered, without
+    # reading the rest of the input
+    def chunks():
+        yield '[1, {"a": x'
+        for _ in range(100):
+            yield " " * 1000
+        assert False
+
+    splitter = _Splitter(max_pending=10000)
+    try:
+        for chunk in chunks():
+            splitter.feed(chunk)
+        assert False
+    except json.JSONDecodeError:
+        pass
+
+
+def test_iter_json_ndjson():
+    s = '{"a": 1, "b": []}\n\n{"a": 2, "b": ["é"]}'
+    for chunk_size in [1, 5, 1 << 16]:
+        fp = io.BytesIO(s.encode())
+        assert list(iter_json(fp, Item, chunk_size=chunk_size)) == [
+            Item(a=1, b=[]),
+            Item(a=2, b=["é"]),
+        ]
+
+    s = "[1]\n[2, 3]\n"
+    assert list(iter_json(io.StringIO(s), list[int], format="ndjson")) == [
+        [1],
+        [2, 3],
+    ]
+
+
+def test_iter_json_errors():
+    s = '{"a": 1, "b": []}\n{"a": "2", "b": []}\n{"a": \n{"a": 4, "b": []}\n'
+
+    it = iter_json(io.StringIO(s), Item)
+    assert next(it) == Item(a=1, b=[])
+    try:
+        next(it)
+        assert False
+    except ValidationErrors as e:
+        assert type(e.errors[0]) is ValidationTypeError
+        assert e.errors[0].keys == [1, "a"]
+
+    errors = []
+    it = iter_json(io.StringIO(s), Item, skip_invalid=True, on_error=errors.append)
+    assert list(it) == [Item(a=1, b=[]), Item(a=4, b=[])]
+    assert [type(e.errors[0]) for e in errors] == [
+        ValidationTypeError,
+        ValidationJSONError,
+    ]
+    assert [e.errors[0].keys for e in errors] == [[1, "a"], [2]]
+
+    for s in ["[1, 2", "[1 2]", "[1] 2", "{"]:
+        try:
+            list(iter_json(io.StringIO(s), int, format="array"))
+            assert False
+        except json.JSONDecodeError:
+            pass
+
+    # positions are in the whole input, not in the buffered tail
+    s = "[1, 2,\n 3, x, 4]"
+    for chunk_size in [1, 4, 1 << 16]:
+        try:
+            list(iter_json(io.StringIO(s), int, chunk_size=chunk_size))
+            assert False
+        except json.JSONDecodeError as e:
+            assert (e.pos, e.lineno, e.colno) == (11, 2, 5)
+            assert "line 2 column 5 (char 11)" in str(e)
+
+
+def test_from_json_file(tmp_path):
+    path = tmp_path / "items.json"
+    items = [{"a": i, "b": ["x"]} for i in range(10)]
+    path.write_text(json.dumps(items))
+    expected = [Item(a=i, b=["x"]) for i in range(10)]
+
+    assert from_json_file(path, list[Item]) == expected
+    assert from_json_file(path, list[Item] | Item) == expected
+    assert list(iter_json_file(path, Item)) == expected
+
+    items[3]["a"] = "3"
+    items[7]["b"] = [7]
+    path.write_text(json.dumps(items))
+    for kwargs, keys in [
+        ({}, [[3, "a"], [7, "b", 0]]),
+        ({"fail_fast": True}, [[3, "a"]]),
+    ]:
+        try:
+            from_json_file(path, list[Item], **kwargs)
+            assert False
+        except ValidationErrors as e:
+            assert [e.keys for e in e.errors] == keys
+
+    path.write_text('{"a": 1, "b": []}')
+    assert from_json_file(path, Item) == Item(a=1, b=[])
+
+    path.write_text("")
+    assert list(iter_json_file(path, Item)) == []
+    try:
+        from_json_file(path, Item)
+        assert False
+    except json.JSONDecodeError:
+        pass
+
+
+def test_from_json_buffer():
+    s = '{"a": 1, "b": ["é"]}'
+    assert from_json(memoryview(s.encode()), Item) == Item(a=1, b=["é"])
+    assert from_json(memoryview(s.encode("utf-16")), Item) == Item(a=1, b=["é"])
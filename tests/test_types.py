@@ -1,9 +1,13 @@
-from typing import Dict, List, Set, Tuple, Union
+import enum
+from dataclasses import dataclass
+from typing import Annotated, Dict, List, Set, Tuple, Union
 from python_dejson.errors import (
+    ValidationErrors,
     ValidationTupleLenError,
     ValidationTypeError,
     ValidationTypesError,
 )
+from python_dejson.dejson import Discriminator, from_object
 from .shared import err_to_dict, from_object_err, from_object_val
 
 
@@ -180,3 +184,134 @@ def test_complex_type():
         [{1: 2}],
         [{3: 4}],
     ]
+
+
+def test_nested_error_keys():
+    err = from_object_err([{}, {"a": [1, 2, "3"], "b": ["4"]}], list[dict[str, list[int]]])
+    assert [e.keys for e in err.errors] == [[1, "a", 2], [1, "b", 0]]
+
+    err = from_object_err([[1, "2"]], list[int | tuple[int, int]])
+    assert [e.keys for e in err.errors] == [[0]]
+
+
+def test_fail_fast():
+    val = [1, "2", 3, "4", "5"]
+
+    err = from_object_err(val, list[int])
+    assert [e.keys for e in err.errors] == [[1], [3], [4]]
+
+    try:
+        from_object(val, list[int], fail_fast=True)
+        assert False
+    except ValidationErrors as e:
+        assert [e.keys for e in e.errors] == [[1]]
+
+    try:
+        from_object({"a": val, "b": val}, dict[str, list[int]], max_errors=2)
+        assert False
+    except ValidationErrors as e:
+        assert [e.keys for e in e.errors] == [["a", 1], ["a", 3]]
+
+    assert from_object(val[:1], list[int], fail_fast=True) == [1]
+
+
+def test_enum():
+    class A(enum.Enum):
+        a = 1
+        b = 2
+        c = 2
+        d = [3]
+        e = 4
+        f = [3]
+
+    assert from_object_val(1, A) is A.a
+    assert from_object_val(2, A) is A.b
+    assert from_object_val(1.0, A) is A.a
+    assert from_object_val([3], A) is A.d
+    assert from_object_val(4, A) is A.e
+    assert from_object_val(5, A) is None
+    assert from_object_val({}, A) is None
+
+    err = from_object_err("1", A)
+    assert err_to_dict(err) == {
+        "class_type": A,
+        "errors": [
+            {
+                "cls": ValidationTypeError,
+                "value": "1",
+                "type": str,
+                "expected_type": A,
+                "keys": [],
+            }
+        ],
+    }
+
+
+def test_union_prefilter():
+    @dataclass
+    class A:
+        x: int
+
+    typ = list[int] | A | dict[str, int] | int
+    assert from_object_val([1], typ) == [1]
+    assert from_object_val({"x": 1}, typ) == A(x=1)
+    assert from_object_val({"y": 1}, typ) == {"y": 1}
+    assert from_object_val(1, typ) == 1
+    assert from_object_val("1", typ) is None
+
+
+def test_tagged_union():
+    class Kind(enum.Enum):
+        dog = "dog"
+
+    @dataclass
+    class Cat:
+        lives: int
+        kind: str = "cat"
+
+    @dataclass
+    class Dog:
+        name: str
+        kind: Kind = Kind.dog
+
+    typ = Annotated[Cat | Dog, Discriminator("kind")]
+    assert from_object_val({"kind": "cat", "lives": 9}, typ) == Cat(lives=9)
+    assert from_object_val({"kind": "dog", "name": "a"}, typ) == Dog(name="a")
+    assert from_object_val({"kind": "dog", "lives": 9}, typ) is None
+    assert from_object_val([{"kind": "cat", "lives": 1}], list[typ]) == [Cat(lives=1)]
+
+    # errors come from the arm picked by the tag
+    err = from_object_err({"kind": "cat", "lives": "9"}, typ)
+    assert [(type(e), e.keys) for e in err.errors] == [(ValidationTypeError, ["lives"])]
+
+    for val in [{"kind": "bird"}, {"kind": []}, {}, []]:
+        err = from_object_err(val, typ)
+        assert [type(e) for e in err.errors] == [ValidationTypesError]
+
+
+def test_plain_containers():
+    val = list(range(10))
+    assert from_object(val, list[int]) is val
+    assert from_object((1, 2), list[int]) == [1, 2]
+    assert from_object([True, 2], list[int]) == [True, 2]
+    assert from_object_val([1, 2.0], list[int]) is None
+
+    val = {"a": 1.5, "b": 2.5}
+    assert from_object(val, dict[str, float]) is val
+    assert from_object_val({"a": 1}, dict[str, float]) is None
+
+    err = from_object_err({"a": 1.5, 2: "b"}, dict[str, float])
+    assert [(type(e), e.keys) for e in err.errors] == [
+        (ValidationTypeError, [2]),
+        (ValidationTypeError, [2]),
+    ]
+
+
+def test_variadic_tuple():
+    assert from_object_val([1, 2, 3], tuple[int, ...]) == (1, 2, 3)
+    assert from_object_val([], Tuple[int, ...]) == ()
+    assert from_object_val([[1], [2, 3]], tuple[list[int], ...]) == ([1], [2, 3])
+    assert from_object_val({1: 2}, tuple[int, ...]) is None
+
+    err = from_object_err([1, "2"], tuple[int, ...])
+    assert [(type(e), e.keys) for e in err.errors] == [(ValidationTypeError, [1])]